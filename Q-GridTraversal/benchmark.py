@@ -0,0 +1,299 @@
+"""島の数え上げの各実装のベンチマーク
+
+使い方:
+    python benchmark.py count --sizes 1000 4000 10000 --density 0.5
+    python benchmark.py label --sizes 1000 2000 --connectivity 8
+    python benchmark.py stream --sizes 1000 2000
+    python benchmark.py online --size 1000 --updates 1000000
+    python benchmark.py parallel --size 4000 --processes 1 2 4 --tile 512
+    python benchmark.py bits --sizes 1000 4000 10000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from bit_grid import BitGrid
+from island_counting import ByteGrid, get_island_count
+from labeling import label_components, label_components_numpy, np
+from online import OnlineIslands
+from parallel import count_islands_parallel
+from streaming import count_islands_streaming, read_rows
+
+
+def random_mask(h, w, density=0.5, seed=0) -> ByteGrid:
+    """各マスが確率 density で 1 になるグリッドを作る (乱数バイト列を translate で 0/1 に変換する)"""
+    rnd = random.Random(seed)
+    table = bytes(int(b < density * 256) for b in range(256))
+    return ByteGrid(h, w, bytearray(rnd.randbytes(h * w).translate(table)))
+
+
+def recursive_island_count(grid):
+    """IslandCounting.ipynb の再帰版 (比較用にそのまま写したもの)"""
+    input = [row[:] for row in grid]
+
+    def dfs(i, j):
+        if i < 0 or i >= len(input) or j < 0 or j >= len(input[0]) or input[i][j] == 0:
+            return
+        input[i][j] = 0
+        dfs(i + 1, j)
+        dfs(i - 1, j)
+        dfs(i, j + 1)
+        dfs(i, j - 1)
+
+    count = 0
+    for i in range(len(input)):
+        for j in range(len(input[0])):
+            if input[i][j] == 1:
+                count += 1
+                dfs(i, j)
+    return count
+
+
+def measure(func, *args, memory=True):
+    """func(*args) の (結果, 実行時間[秒], ピークメモリ[MB]) を返す
+
+    時間は tracemalloc なしで計測し、memory=True ならもう一度 tracemalloc 下で実行してピークを測る。
+    """
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_row(cells, widths):
+    return "  ".join(str(c).rjust(wd) for c, wd in zip(cells, widths))
+
+
+def bench_count(args):
+    """get_island_count (ByteGrid / リストのリスト) と再帰版を比べる
+
+    リストのリストと再帰版は --list-max 以下のサイズだけ計測する。
+    """
+    widths = (6, 12, 10, 10, 10)
+    print(format_row(("size", "impl", "islands", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        grid = random_mask(size, size, args.density, args.seed)
+        count, elapsed, peak = measure(get_island_count, grid, memory=not args.no_memory)
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(format_row((size, "bytegrid", count, f"{elapsed:.2f}", peak), widths))
+        if size > args.list_max:
+            continue
+
+        rows = grid.rows()
+        result, elapsed, peak = measure(get_island_count, rows, memory=not args.no_memory)
+        assert result == count, "リストのリストの結果が異なります"
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(format_row((size, "rows", result, f"{elapsed:.2f}", peak), widths))
+        try:
+            result, elapsed, _ = measure(recursive_island_count, rows, memory=False)
+            assert result == count, "再帰版の結果が異なります"
+            print(format_row((size, "recursive", result, f"{elapsed:.2f}", "-"), widths))
+        except RecursionError:
+            print(format_row((size, "recursive", "RecursionError", "-", "-"), widths))
+
+
+def bench_label(args):
+    """2パスのラベリング (array 版 / numpy 版) を比べる。4 近傍なら get_island_count とも比べる"""
+    impls = [("array", label_components)]
+    if np is not None:
+        impls.append(("numpy", label_components_numpy))
+    widths = (6, 12, 10, 10, 10)
+    print(format_row(("size", "impl", "islands", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        grid = random_mask(size, size, args.density, args.seed)
+        expected = None
+        if args.connectivity == 4:
+            expected, elapsed, peak = measure(get_island_count, grid, memory=not args.no_memory)
+            peak = "-" if peak is None else f"{peak:.1f}"
+            print(format_row((size, "count", expected, f"{elapsed:.2f}", peak), widths))
+        for name, func in impls:
+            result, elapsed, peak = measure(func, grid, args.connectivity, memory=not args.no_memory)
+            if expected is None:
+                expected = len(result)
+            assert len(result) == expected, f"{name} の成分数が異なります"
+            peak = "-" if peak is None else f"{peak:.1f}"
+            print(format_row((size, name, len(result), f"{elapsed:.2f}", peak), widths))
+
+
+def write_text_mask(grid: ByteGrid, path):
+    """grid を "h w" の行と空白区切りの 0 / 1 の行のテキストとして書き出す"""
+    digits = bytes.maketrans(b"\x00\x01", b"01")
+    w = grid.w
+    line = bytearray(b" " * (2 * w))
+    line[-1:] = b"\n"
+    with open(path, "wb") as f:
+        f.write(f"{grid.h} {w}\n".encode())
+        for x in range(grid.h):
+            line[0::2] = grid.cells[x * w:(x + 1) * w].translate(digits)
+            f.write(line)
+
+
+def count_from_file(path, streaming):
+    """テキストのファイルを読んで島を数える (streaming=False なら全行を ByteGrid に読み込んでから数える)"""
+    with open(path, "rb") as f:
+        if streaming:
+            return count_islands_streaming(f)
+        header = f.readline()
+        f.seek(0)
+        h, w = map(int, header.split())
+        return get_island_count(ByteGrid(h, w, bytearray(b"".join(read_rows(f)))), in_place=True)
+
+
+def bench_stream(args):
+    """ファイルから1行ずつ数える版と、全体を読み込んでから数える版を比べる"""
+    widths = (6, 12, 10, 10, 10)
+    print(format_row(("size", "impl", "islands", "time[s]", "peak[MB]"), widths))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"mask{size}.txt")
+            write_text_mask(random_mask(size, size, args.density, args.seed), path)
+            expected = None
+            for name, streaming in (("load", False), ("streaming", True)):
+                result, elapsed, peak = measure(count_from_file, path, streaming, memory=not args.no_memory)
+                if expected is None:
+                    expected = result
+                assert result == expected, f"{name} の結果が異なります"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, name, result, f"{elapsed:.2f}", peak), widths))
+
+
+def bench_online(args):
+    """OnlineIslands で更新のたびに数を答える場合と、毎回 get_island_count で数え直す場合を比べる
+
+    数え直しは --checks 回だけ実行して 1 回あたりの時間を測り、結果が一致することも確かめる。
+    """
+    size = args.size
+    n = size * size
+    rnd = random.Random(args.seed)
+    updates = [rnd.randrange(n) for _ in range(args.updates)]
+    checkpoints = sorted(rnd.sample(range(len(updates)), min(args.checks, len(updates))))
+
+    islands = OnlineIslands(size, size)
+    t0 = time.perf_counter()
+    counts = islands.add_many_flat(updates)
+    online = time.perf_counter() - t0
+
+    grid = ByteGrid(size, size, bytearray(n))
+    recompute = 0.0
+    done = 0
+    for k in checkpoints:
+        for i in updates[done:k + 1]:
+            grid.cells[i] = 1
+        done = k + 1
+        t0 = time.perf_counter()
+        count = get_island_count(grid)
+        recompute += time.perf_counter() - t0
+        assert count == counts[k], f"{k} 件目の更新の後の島の数が異なります"
+
+    widths = (12, 12, 14, 14)
+    print(format_row(("impl", "updates", "total[s]", "per update[us]"), widths))
+    print(format_row(("online", len(updates), f"{online:.2f}", f"{online / len(updates) * 1e6:.2f}"), widths))
+    if checkpoints:
+        per = recompute / len(checkpoints)
+        print(format_row(("recompute", len(checkpoints), f"{recompute:.2f}", f"{per * 1e6:.0f}"), widths))
+        print(f"{len(updates)} 件すべてを数え直すと約 {per * len(updates):.0f} 秒")
+
+
+def bench_parallel(args):
+    """count_islands_parallel のワーカー数ごとの時間を、get_island_count (1 プロセス) と比べる"""
+    grid = random_mask(args.size, args.size, args.density, args.seed)
+    expected, serial, _ = measure(get_island_count, grid, memory=False)
+    widths = (10, 10, 10, 10)
+    print(format_row(("processes", "islands", "time[s]", "speedup"), widths))
+    print(format_row(("serial", expected, f"{serial:.2f}", "1.00"), widths))
+    for processes in args.processes:
+        result, elapsed, _ = measure(count_islands_parallel, grid, processes, args.tile, args.engine, memory=False)
+        assert result == expected, f"{processes} プロセスの結果が異なります"
+        print(format_row((processes, result, f"{elapsed:.2f}", f"{serial / elapsed:.2f}"), widths))
+
+
+def bench_bits(args):
+    """リストのリスト / ByteGrid / BitGrid の大きさと、get_island_count・label_components の時間とピークメモリを比べる
+
+    リストのリストの大きさは --list-max 以下のサイズだけ tracemalloc で測る。
+    """
+    widths = (6, 10, 12, 10, 10, 10)
+    print(format_row(("size", "grid", "grid[MB]", "task", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        grid = random_mask(size, size, args.density, args.seed)
+        bits, pack, _ = measure(BitGrid.from_cells, size, size, grid.cells, memory=False)
+        if size <= args.list_max:
+            # rows() の結果はすぐ捨てるが、ピークには残る
+            tracemalloc.start()
+            len(grid.rows())
+            list_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            print(format_row((size, "rows", f"{list_mb:.1f}", "-", "-", "-"), widths))
+        print(format_row((size, "bitgrid", f"{bits.nbytes / 2**20:.1f}", "pack", f"{pack:.2f}", "-"), widths))
+
+        tasks = [("count", get_island_count)]
+        if size <= args.label_max:
+            tasks.append(("label", label_components))
+        for task, func in tasks:
+            expected = None
+            for name, g, nbytes in (("bytegrid", grid, len(grid.cells)), ("bitgrid", bits, bits.nbytes)):
+                result, elapsed, peak = measure(func, g, memory=not args.no_memory)
+                result = result if isinstance(result, int) else len(result)
+                if expected is None:
+                    expected = result
+                assert result == expected, f"{name} の {task} の結果が異なります"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, name, f"{nbytes / 2**20:.1f}", task, f"{elapsed:.2f}", peak), widths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--density", type=float, default=0.5, help="1 のマスの割合")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc によるメモリ計測を省略する")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("count", help="get_island_count と再帰版の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 10000])
+    p.add_argument("--list-max", type=int, default=1000, help="リストのリストと再帰版を計測する最大サイズ")
+    p.set_defaults(func=bench_count)
+
+    p = sub.add_parser("label", help="連結成分ラベリング (array 版 / numpy 版) の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000])
+    p.add_argument("--connectivity", type=int, choices=(4, 8), default=4)
+    p.set_defaults(func=bench_label)
+
+    p = sub.add_parser("stream", help="1行ずつ数える版と全体を読み込む版の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000])
+    p.set_defaults(func=bench_stream)
+
+    p = sub.add_parser("online", help="OnlineIslands と毎回の数え直しの比較")
+    p.add_argument("--size", type=int, default=1000, help="グリッドの一辺")
+    p.add_argument("--updates", type=int, default=1000000, help="陸にするマスの数 (重複あり)")
+    p.add_argument("--checks", type=int, default=10, help="数え直して結果を確かめる回数")
+    p.set_defaults(func=bench_online)
+
+    p = sub.add_parser("parallel", help="タイル分割の並列版のワーカー数ごとの比較")
+    p.add_argument("--size", type=int, default=4000, help="グリッドの一辺")
+    p.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--tile", type=int, default=512, help="タイルの一辺")
+    p.add_argument("--engine", choices=("array", "numpy"), default="array")
+    p.set_defaults(func=bench_parallel)
+
+    p = sub.add_parser("bits", help="BitGrid と ByteGrid・リストのリストのメモリと速度の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 10000])
+    p.add_argument("--list-max", type=int, default=2000, help="リストのリストの大きさを測る最大サイズ")
+    p.add_argument("--label-max", type=int, default=1000, help="label_components を計測する最大サイズ")
+    p.set_defaults(func=bench_bits)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
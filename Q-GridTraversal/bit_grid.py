@@ -0,0 +1,131 @@
+"""1 マス 1 ビットの 0/1 グリッド
+
+各行を (w + 7) // 8 バイトに詰め、行ごとに連続した bytearray に置く。1 行の中は numpy.packbits と同じく
+上位ビットが先頭の列 (列 y は行の先頭バイトから数えて y ビット目、各バイトの中では上位ビットから)。
+40000 x 40000 のマスクが 200 MB に収まる (リストのリストだと 1 マスあたり 8 バイト以上、bytearray でも 1 バイト)。
+
+行全体は Python の int として取り出せる (row_bits)。この int では列 y がビット w - 1 - y なので、
+シフトや & / | で行単位の演算をまとめて行える。
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 0/1 のバイト列と、"0" / "1" の文字列を相互に変換する表
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class BitGrid:
+    """h x w の 0/1 のグリッドを行ごとにビットを詰めた bytearray で保持する"""
+
+    def __init__(self, h: int, w: int, bits: bytearray = None):
+        self.h = h
+        self.w = w
+        self.stride = (w + 7) // 8
+        # 各行の末尾の余りビットは常に 0 にしておく
+        self.pad = self.stride * 8 - w
+        if bits is None:
+            bits = bytearray(h * self.stride)
+        if len(bits) != h * self.stride:
+            raise ValueError(f"bits の長さ {len(bits)} が h * stride = {h * self.stride} と一致しません")
+        self.bits = bits
+
+    @classmethod
+    def from_cells(cls, h, w, cells):
+        """1 マス 1 バイト (index = x * w + y) の 0/1 の列から作る (ByteGrid.cells など)"""
+        grid = cls(h, w)
+        for x in range(h):
+            grid.set_row(x, cells[x * w:(x + 1) * w])
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows):
+        """リストのリスト形式 (各マス 0 か 1) から作る"""
+        h, w = len(rows), len(rows[0]) if rows else 0
+        grid = cls(h, w)
+        for x, row in enumerate(rows):
+            grid.set_row(x, bytes(row))
+        return grid
+
+    @classmethod
+    def from_numpy(cls, mask):
+        """2次元の numpy 配列から作る (0 以外を 1 とみなす)"""
+        h, w = mask.shape
+        return cls(h, w, bytearray(np.packbits(mask != 0, axis=1).tobytes()))
+
+    def to_numpy(self):
+        """形が (h, w) の uint8 の numpy 配列にする"""
+        packed = np.frombuffer(self.bits, dtype=np.uint8).reshape(self.h, self.stride)
+        return np.unpackbits(packed, axis=1, count=self.w)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def get(self, x, y) -> int:
+        return self.bits[x * self.stride + (y >> 3)] >> (7 - (y & 7)) & 1
+
+    def set(self, x, y, value=1):
+        k = x * self.stride + (y >> 3)
+        bit = 0x80 >> (y & 7)
+        if value:
+            self.bits[k] |= bit
+        else:
+            self.bits[k] &= ~bit & 0xFF
+
+    def row_bits(self, x) -> int:
+        """行 x を int で返す (列 y がビット w - 1 - y)"""
+        k = x * self.stride
+        return int.from_bytes(self.bits[k:k + self.stride], "big") >> self.pad
+
+    def set_row_bits(self, x, value: int):
+        """行 x を row_bits と同じ形式の int で置き換える (w ビットより上は無視する)"""
+        k = x * self.stride
+        value &= (1 << self.w) - 1
+        self.bits[k:k + self.stride] = (value << self.pad).to_bytes(self.stride, "big")
+
+    def row(self, x) -> bytes:
+        """行 x を 1 マス 1 バイトの bytes に展開する"""
+        if not self.w:
+            return b""
+        return format(self.row_bits(x), f"0{self.w}b").encode().translate(_FROM_DIGITS)
+
+    def set_row(self, x, row):
+        """行 x を 1 マス 1 バイトの 0/1 の列で置き換える"""
+        if len(row) != self.w:
+            raise ValueError(f"行の長さ {len(row)} が w = {self.w} と一致しません")
+        if self.w:
+            self.set_row_bits(x, int(bytes(row).translate(_TO_DIGITS), 2))
+
+    def iter_rows(self):
+        """各行を 1 マス 1 バイトの bytes に展開しながら順に返す (展開に使うメモリは 1 行分だけ)"""
+        for x in range(self.h):
+            yield self.row(x)
+
+    def cells(self) -> bytearray:
+        """全体を 1 マス 1 バイト (index = x * w + y) の bytearray に展開する"""
+        return bytearray(b"".join(self.iter_rows()))
+
+    def rows(self) -> list[list[int]]:
+        return [list(row) for row in self.iter_rows()]
+
+    def neighbors(self, x, y) -> list[tuple[int, int]]:
+        """(x, y) の上下左右のうち 1 のマスを返す"""
+        result = []
+        for i, j in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= i < self.h and 0 <= j < self.w and self.get(i, j):
+                result.append((i, j))
+        return result
+
+    def adjacent_bits(self, x) -> int:
+        """行 x のマスのうち、上下左右に 1 のマスがあるものを row_bits と同じ形式の int で返す"""
+        bits = self.row_bits(x)
+        mask = (bits << 1 | bits >> 1) & ((1 << self.w) - 1)
+        if x > 0:
+            mask |= self.row_bits(x - 1)
+        if x + 1 < self.h:
+            mask |= self.row_bits(x + 1)
+        return mask
@@ -0,0 +1,109 @@
+"""IslandCounting.ipynb の get_island_count をモジュールにしたもの
+
+再帰の DFS の代わりに、1次元の bytearray 上で明示的なスタックを使うスキャンライン法で島を塗りつぶす。
+再帰しないので sys.setrecursionlimit に触れる必要がなく、大きな島でも RecursionError にならない。
+"""
+
+from bit_grid import BitGrid
+from streaming import count_islands_streaming
+
+
+class ByteGrid:
+    """h x w の 0/1 のグリッドを 1 マス 1 バイトの bytearray で保持する (index = x * w + y)"""
+
+    def __init__(self, h: int, w: int, cells: bytearray):
+        if len(cells) != h * w:
+            raise ValueError(f"cells の長さ {len(cells)} が h * w = {h * w} と一致しません")
+        self.h = h
+        self.w = w
+        self.cells = cells
+
+    @classmethod
+    def from_rows(cls, rows):
+        """リストのリスト形式 (各マス 0 か 1) から ByteGrid を作る"""
+        h, w = len(rows), len(rows[0]) if rows else 0
+        return cls(h, w, bytearray(b"".join(map(bytes, rows))))
+
+    def rows(self) -> list[list[int]]:
+        w = self.w
+        return [list(self.cells[x * w:(x + 1) * w]) for x in range(self.h)]
+
+    def copy(self):
+        return ByteGrid(self.h, self.w, bytearray(self.cells))
+
+
+def as_byte_grid(grid) -> ByteGrid:
+    """ByteGrid はそのまま、BitGrid とリストのリストは ByteGrid に変換して返す"""
+    if isinstance(grid, ByteGrid):
+        return grid
+    if isinstance(grid, BitGrid):
+        return ByteGrid(grid.h, grid.w, grid.cells())
+    return ByteGrid.from_rows(grid)
+
+
+def get_island_count(grid, in_place=False):
+    """2次元配列において、1が連なっている部分の数を返す
+
+    grid: リストのリスト、ByteGrid、または BitGrid
+    in_place: True なら ByteGrid の cells をそのまま塗りつぶす (呼び出し後はすべて 0 になる)。
+              False なら 1 マス 1 バイトのコピーを作る。リストのリストは常に bytearray に変換する。
+    BitGrid は展開せずに1行ずつ count_islands_streaming で数えるので、追加のメモリは O(w) で済む
+    (in_place は無視する)。
+    """
+    if isinstance(grid, BitGrid):
+        return count_islands_streaming(grid.iter_rows())
+    if not isinstance(grid, ByteGrid):
+        grid = ByteGrid.from_rows(grid)
+    elif not in_place:
+        grid = grid.copy()
+    cells, w = grid.cells, grid.w
+    if not w:
+        return 0
+
+    # 0 のマスは bytearray.find で C の速さで読み飛ばす
+    count = 0
+    zeros = bytes(w)
+    i = cells.find(1)
+    while i >= 0:
+        count += 1
+        fill(cells, w, i, zeros)
+        i = cells.find(1, i)
+    return count
+
+
+def fill(cells: bytearray, w: int, i: int, zeros=None) -> int:
+    """マス i を含む島 (上下左右でつながった 1) を 0 にし、そのマス数を返す
+
+    スタックには「まだ塗っていない 1 のマス」を積み、取り出したら同じ行で連続する 1 の区間を
+    スライス代入でまとめて 0 にする。上下の行では、その区間と重なる 1 の区間ごとに 1 マスだけ積む。
+    zeros には長さ w 以上の 0 の bytes を渡すと、呼び出しごとに作り直さずに済む。
+    """
+    n = len(cells)
+    if zeros is None:
+        zeros = bytes(w)
+    size = 0
+    stack = [i]
+    while stack:
+        i = stack.pop()
+        if not cells[i]:
+            continue
+        row = i - i % w
+        left = cells.rfind(0, row, i) + 1 or row
+        right = cells.find(0, i, row + w)
+        if right < 0:
+            right = row + w
+        cells[left:right] = zeros[:right - left]
+        size += right - left
+
+        for other in (row - w, row + w):
+            if not 0 <= other < n:
+                continue
+            lo, hi = left - row + other, right - row + other
+            j = cells.find(1, lo, hi)
+            while j >= 0:
+                stack.append(j)
+                k = cells.find(0, j, hi)
+                if k < 0:
+                    break
+                j = cells.find(1, k, hi)
+    return size
@@ -0,0 +1,203 @@
+"""2パスの連結成分ラベリング
+
+1パス目で各行の 1 の区間 (ラン) に仮ラベルを付け、上の行のランと重なれば Union-Find で同じ集合にする。
+2パス目で仮ラベルを、ラスター順に最初に現れた成分から 1, 2, ... と振り直し、ラベル画像と成分ごとの統計を作る。
+背景 (0 のマス) のラベルは 0。
+"""
+
+from array import array
+from collections import namedtuple
+
+from bit_grid import BitGrid
+from island_counting import ByteGrid, as_byte_grid
+from union_find import DisjointSet
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# size: マス数、top / left / bottom / right: 成分を囲む長方形 (bottom, right も成分に含まれる)
+Component = namedtuple("Component", ["label", "size", "top", "left", "bottom", "right"])
+
+
+class Labeling:
+    """ラベリングの結果
+
+    labels: h * w 個のラベル (index = x * w + y)。label_components では array('l')、
+            label_components_numpy では int64 の1次元 numpy 配列
+    components: ラベル 1, 2, ... の順に並べた Component のリスト
+    """
+
+    def __init__(self, h: int, w: int, labels, components: list[Component]):
+        self.h = h
+        self.w = w
+        self.labels = labels
+        self.components = components
+
+    def __len__(self):
+        return len(self.components)
+
+    def label_at(self, x, y) -> int:
+        return int(self.labels[x * self.w + y])
+
+    def rows(self) -> list[list[int]]:
+        w = self.w
+        return [[int(v) for v in self.labels[x * w:(x + 1) * w]] for x in range(self.h)]
+
+
+def _check_connectivity(connectivity):
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity は 4 か 8 です: {connectivity}")
+    # 上の行のランと「重なる」とみなす列のずれ (8 近傍なら斜めに接していてもつながる)
+    return connectivity == 8
+
+
+def _iter_rows(grid):
+    """各行を 1 マス 1 バイトの bytes / bytearray で順に返す (BitGrid は1行ずつ展開する)"""
+    if isinstance(grid, BitGrid):
+        return grid.iter_rows()
+    grid = as_byte_grid(grid)
+    cells, w = grid.cells, grid.w
+    return (cells[x * w:(x + 1) * w] for x in range(grid.h))
+
+
+def label_components(grid, connectivity=4) -> Labeling:
+    """grid (リストのリスト、ByteGrid、または BitGrid) の 1 の連結成分にラベルを付ける
+
+    connectivity: 4 なら上下左右、8 なら斜めも含めてつながっているとみなす
+    """
+    k = _check_connectivity(connectivity)
+    if not isinstance(grid, BitGrid):
+        grid = as_byte_grid(grid)
+    h, w = grid.h, grid.w
+
+    # 1パス目: ランごとに仮ラベル (= Union-Find の要素番号) を付ける
+    sets = DisjointSet()
+    runs = []  # (行, 左端, 右端 (含まない), 仮ラベル) をラスター順に並べたもの
+    prev = []
+    for x, row in enumerate(_iter_rows(grid)):
+        current = []
+        j = 0
+        left = row.find(1)
+        while left >= 0:
+            right = row.find(0, left)
+            if right < 0:
+                right = w
+            label = sets.make_set()
+            # 上の行のランのうち、この区間の左で終わっているものは次のランとも重ならない
+            while j < len(prev) and prev[j][1] + k <= left:
+                j += 1
+            m = j
+            while m < len(prev) and prev[m][0] < right + k:
+                sets.union(label, prev[m][2])
+                m += 1
+            # 最後に重なったランは次のランとも重なり得るので j は進めない
+            current.append((left, right, label))
+            runs.append((x, left, right, label))
+            if right == w:
+                break
+            left = row.find(1, right)
+        prev = current
+
+    # 2パス目: 根ごとに最終ラベルを振り、ラベル画像と統計を作る
+    labels = array("l", bytes(array("l").itemsize * h * w))
+    final = {}
+    stats = []  # [size, top, left, bottom, right]
+    for x, left, right, label in runs:
+        root = sets.find(label)
+        number = final.get(root)
+        if number is None:
+            number = final[root] = len(stats) + 1
+            stats.append([0, x, left, x, right - 1])
+        s = stats[number - 1]
+        s[0] += right - left
+        if left < s[2]:
+            s[2] = left
+        s[3] = x
+        if right - 1 > s[4]:
+            s[4] = right - 1
+        labels[x * w + left:x * w + right] = array("l", [number]) * (right - left)
+
+    components = [Component(number, *s) for number, s in enumerate(stats, 1)]
+    return Labeling(h, w, labels, components)
+
+
+def label_components_numpy(grid, connectivity=4) -> Labeling:
+    """label_components の numpy 版 (同じラベルと統計を返す)
+
+    ランの検出、上の行のランとの重なりの列挙 (searchsorted)、ラベルの伝播をすべて配列演算で行う。
+    ラベルの伝播は「各辺の両端の根のうち大きい方を小さい方につなぐ」と「ポインタジャンプ」を収束するまで繰り返す。
+    根は常に成分内で最も番号の小さい (= ラスター順で最初の) ランになる。
+    grid にはリストのリスト、ByteGrid、BitGrid、2次元の numpy 配列を渡せる。
+    """
+    if np is None:
+        raise ImportError("label_components_numpy には numpy が必要です")
+    k = int(_check_connectivity(connectivity))
+    if isinstance(grid, BitGrid):
+        mask = grid.to_numpy()
+    elif isinstance(grid, ByteGrid):
+        mask = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.h, grid.w)
+    else:
+        mask = np.asarray(grid, dtype=np.uint8)
+        if mask.ndim != 2:
+            mask = mask.reshape(len(grid), len(grid[0]) if len(grid) else 0)
+    h, w = mask.shape
+
+    # 左右に 0 の列を足して1次元にすると、差分の +1 / -1 がランの始まり / 終わりになる
+    stride = w + 2
+    padded = np.zeros((h, stride), dtype=np.int8)
+    padded[:, 1:-1] = mask != 0
+    diff = np.diff(padded.ravel())
+    starts = np.flatnonzero(diff == 1) + 1
+    ends = np.flatnonzero(diff == -1) + 1
+    run_rows = starts // stride
+    lefts = starts % stride - 1
+    rights = ends % stride - 1
+    n = len(starts)
+
+    # 上の行で重なるランは連続した範囲 [first, last) になる。stride > w + 1 なので2行上のランは範囲に入らない
+    prev_base = (run_rows - 1) * stride
+    first = np.searchsorted(run_rows * stride + rights, prev_base + lefts - k, side="right")
+    last = np.searchsorted(run_rows * stride + lefts, prev_base + rights + k, side="left")
+    counts = np.maximum(last - first, 0)
+    a = np.repeat(np.arange(n), counts)
+    b = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    parent = np.arange(n)
+    while True:
+        pa, pb = parent[a], parent[b]
+        changed = pa != pb
+        if not changed.any():
+            break
+        np.minimum.at(parent, np.maximum(pa, pb)[changed], np.minimum(pa, pb)[changed])
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    # 根は番号順 = ラスター順に最初に現れた順なので、unique の inverse がそのまま最終ラベルになる
+    roots, numbers = np.unique(parent, return_inverse=True)
+    numbers = numbers.ravel() + 1
+    lengths = rights - lefts
+
+    labels = np.zeros(h * w + 1, dtype=np.int64)
+    np.add.at(labels, run_rows * w + lefts, numbers)
+    np.add.at(labels, run_rows * w + rights, -numbers)
+    labels = np.cumsum(labels[:-1])
+
+    count = len(roots)
+    sizes = np.bincount(numbers, weights=lengths, minlength=count + 1)[1:].astype(np.int64)
+    top = run_rows[roots]
+    bottom = np.zeros(count, dtype=np.int64)
+    np.maximum.at(bottom, numbers - 1, run_rows)
+    left = np.full(count, w, dtype=np.int64)
+    np.minimum.at(left, numbers - 1, lefts)
+    right = np.zeros(count, dtype=np.int64)
+    np.maximum.at(right, numbers - 1, rights - 1)
+
+    components = [
+        Component(number, *map(int, s)) for number, s in enumerate(zip(sizes, top, left, bottom, right), 1)
+    ]
+    return Labeling(h, w, labels, components)
@@ -0,0 +1,122 @@
+"""「このマスが陸になった」という更新を受けながら、島の数をその都度答える
+
+h * w 要素の DisjointSet を最初に確保しておき、陸になったマスを上下左右の陸と union する。
+新しい陸は島を 1 つ増やし、別々の島をつなぐ union が 1 回成功するごとに島が 1 つ減る。
+1 回の更新はほぼ定数時間 (アッカーマン関数の逆関数) で、全体を数え直す必要はない。
+"""
+
+from array import array
+
+from island_counting import as_byte_grid
+from union_find import DisjointSet
+
+
+class OnlineIslands:
+    """h x w の海から始めて、add_land で陸を増やしながら島の数を保つ
+
+    grid を渡すと、その 1 のマスを陸として初期化する。
+    """
+
+    def __init__(self, h: int, w: int, grid=None):
+        self.h = h
+        self.w = w
+        self.sets = DisjointSet(h * w)
+        self.land = bytearray(h * w)
+        self.count = 0
+        if grid is not None:
+            grid = as_byte_grid(grid)
+            if (grid.h, grid.w) != (h, w):
+                raise ValueError(f"grid の大きさ {grid.h}x{grid.w} が {h}x{w} と一致しません")
+            cells = grid.cells
+            self.add_many_flat(i for i in range(h * w) if cells[i])
+
+    @classmethod
+    def from_grid(cls, grid):
+        grid = as_byte_grid(grid)
+        return cls(grid.h, grid.w, grid)
+
+    def is_land(self, i, j) -> bool:
+        return bool(self.land[i * self.w + j])
+
+    def add_land(self, i, j) -> int:
+        """マス (i, j) を陸にして、更新後の島の数を返す (すでに陸なら何もしない)"""
+        if not (0 <= i < self.h and 0 <= j < self.w):
+            raise IndexError(f"マス ({i}, {j}) はグリッドの外です")
+        w = self.w
+        k = i * w + j
+        land = self.land
+        if land[k]:
+            return self.count
+        land[k] = 1
+        self.count += 1
+        union = self.sets.union
+        find = self.sets.find
+        for other, ok in ((k - w, i > 0), (k + w, i < self.h - 1), (k - 1, j > 0), (k + 1, j < w - 1)):
+            if ok and land[other] and find(k) != find(other):
+                union(k, other)
+                self.count -= 1
+        return self.count
+
+    def add_many(self, updates) -> array:
+        """(i, j) の列を順に add_land し、各更新の後の島の数を array('l') で返す"""
+        return self.add_many_flat(self._flat(updates))
+
+    def _flat(self, updates):
+        h, w = self.h, self.w
+        for i, j in updates:
+            if not (0 <= i < h and 0 <= j < w):
+                raise IndexError(f"マス ({i}, {j}) はグリッドの外です")
+            yield i * w + j
+
+    def add_many_flat(self, updates) -> array:
+        """index (= i * w + j) の列を順に陸にし、各更新の後の島の数を array('l') で返す
+
+        何百万件もの更新を流すための版で、DisjointSet の find / union をループの中に展開している。
+        """
+        h, w = self.h, self.w
+        n = h * w
+        land = self.land
+        parent, rank = self.sets.parent, self.sets.rank
+        count = self.count
+        counts = array("l")
+        append = counts.append
+        # 途中で IndexError になっても、それまでの更新は count に反映しておく
+        try:
+            for k in updates:
+                if not 0 <= k < n:
+                    raise IndexError(f"index {k} はグリッドの外です")
+                if land[k]:
+                    append(count)
+                    continue
+                land[k] = 1
+                count += 1
+                y = k % w
+                for other in (k - w, k + w, k - 1 if y else -1, k + 1 if y < w - 1 else -1):
+                    if other < 0 or other >= n or not land[other]:
+                        continue
+                    # find (経路圧縮)
+                    a = k
+                    while parent[a] != a:
+                        a = parent[a]
+                    x = k
+                    while parent[x] != a:
+                        parent[x], x = a, parent[x]
+                    b = other
+                    while parent[b] != b:
+                        b = parent[b]
+                    x = other
+                    while parent[x] != b:
+                        parent[x], x = b, parent[x]
+                    if a == b:
+                        continue
+                    # union (ランクによる併合)
+                    if rank[a] < rank[b]:
+                        a, b = b, a
+                    parent[b] = a
+                    if rank[a] == rank[b]:
+                        rank[a] += 1
+                    count -= 1
+                append(count)
+        finally:
+            self.count = count
+        return counts
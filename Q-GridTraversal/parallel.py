@@ -0,0 +1,110 @@
+"""グリッドをタイルに分けて、プロセスプールで並列に島を数える
+
+グリッドは共有メモリに1度だけ置き、各ワーカーは担当するタイルだけを読んでラベリングする。
+ワーカーが返すのはタイル内の成分の数と、タイルの四辺のラベルだけなので、プロセス間の転送量は O(タイルの周長)。
+親プロセスでは、隣り合うタイルの境界で向かい合う 1 のマスのラベルを Union-Find で併合し、
+併合が1回成功するごとに島の数を1つ減らす。
+"""
+
+from multiprocessing import Pool, shared_memory
+
+from island_counting import ByteGrid, as_byte_grid
+from labeling import label_components, label_components_numpy
+from union_find import DisjointSet
+
+LABELERS = {"array": label_components, "numpy": label_components_numpy}
+
+# ワーカープロセスごとに1回だけ共有メモリに接続し、以降のタスクで使い回す
+_worker = {}
+
+
+def share_grid(grid: ByteGrid) -> shared_memory.SharedMemory:
+    """grid のセルを共有メモリにコピーして返す (close / unlink は呼び出し側で行う)"""
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(grid.cells)))
+    shm.buf[:len(grid.cells)] = grid.cells
+    return shm
+
+
+def attach_grid(name) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python 3.12 以前は track 引数が無い
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(name, h, w, engine):
+    shm = attach_grid(name)
+    _worker.update(shm=shm, h=h, w=w, label=LABELERS[engine])
+
+
+def _label_tile(tile):
+    """タイル (x0, y0, x1, y1) をラベリングし、(成分の数, 上辺, 下辺, 左辺, 右辺のラベル) を返す"""
+    x0, y0, x1, y1 = tile
+    w = _worker["w"]
+    buf = _worker["shm"].buf
+    th, tw = x1 - x0, y1 - y0
+    cells = bytearray(th * tw)
+    for x in range(th):
+        k = (x0 + x) * w
+        cells[x * tw:(x + 1) * tw] = buf[k + y0:k + y1]
+    result = _worker["label"](ByteGrid(th, tw, cells))
+    labels = result.labels
+    return len(result), labels[:tw], labels[(th - 1) * tw:], labels[::tw], labels[tw - 1::tw]
+
+
+def tiles(h, w, tile) -> list[tuple[int, int, int, int]]:
+    """h x w のグリッドを一辺 tile のタイル (x0, y0, x1, y1) にラスター順に分ける (端のタイルは小さくなる)"""
+    return [(x, y, min(x + tile, h), min(y + tile, w)) for x in range(0, h, tile) for y in range(0, w, tile)]
+
+
+def count_islands_parallel(grid, processes=None, tile=512, engine="array") -> int:
+    """島 (上下左右でつながった 1) の数をタイルごとに並列に数えて返す (get_island_count と同じ数になる)
+
+    processes: ワーカー数 (None なら CPU 数)
+    tile: タイルの一辺のマス数
+    engine: タイルのラベリングに使う実装 ("array" / "numpy")
+    """
+    if tile < 1:
+        raise ValueError(f"tile は 1 以上です: {tile}")
+    # ワーカーの初期化で失敗すると Pool が作り直し続けて返らなくなるので、先に親プロセスで確かめる
+    if engine not in LABELERS:
+        raise ValueError(f"engine は {' / '.join(LABELERS)} のいずれかです: {engine}")
+    grid = as_byte_grid(grid)
+    h, w = grid.h, grid.w
+    if not h or not w:
+        return 0
+    parts = tiles(h, w, tile)
+    shm = share_grid(grid)
+    try:
+        with Pool(processes, initializer=_init_worker, initargs=(shm.name, h, w, engine)) as pool:
+            results = pool.map(_label_tile, parts)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # タイル内のラベル l (1 始まり) を、全体の Union-Find の要素 offsets[タイル] + l - 1 に対応させる
+    offsets = []
+    total = 0
+    for count, *_ in results:
+        offsets.append(total)
+        total += count
+    sets = DisjointSet(total)
+    find, union = sets.find, sets.union
+
+    cols = (w + tile - 1) // tile
+    for k, (count, top, bottom, left, right) in enumerate(results):
+        # 右隣と下隣のタイルとの境界だけを見れば、すべての境界を1回ずつ見ることになる
+        neighbors = []
+        if k % cols + 1 < cols:
+            neighbors.append((right, k + 1, 3))
+        if k + cols < len(results):
+            neighbors.append((bottom, k + cols, 1))
+        for mine, other, side in neighbors:
+            theirs = results[other][side]
+            for a, b in zip(mine, theirs):
+                if a and b:
+                    a, b = offsets[k] + int(a) - 1, offsets[other] + int(b) - 1
+                    if find(a) != find(b):
+                        union(a, b)
+                        total -= 1
+    return total
@@ -0,0 +1,122 @@
+"""グリッドを1行ずつ読みながら島を数える (メモリは O(幅))
+
+直前の行のラン (連続する 1 の区間) と、そのランが属する「まだ閉じていない島」の番号だけを持つ。
+新しい行を読むたびに、直前の行の島と今の行のランを Union-Find でつなぎ、
+今の行のどのランともつながらなかった島は完成したものとして数える。
+Union-Find は行ごとに作り直すので、要素数は幅の半分程度を超えない。
+
+使い方:
+    python streaming.py input.txt
+    python streaming.py < input.txt
+
+入力は 1 行目に "h w"、続く h 行に各マスの 0 / 1 を空白区切りで書いた形式 (min-cost-path と同じ)。
+"""
+
+import argparse
+import sys
+
+from union_find import DisjointSet
+
+# テキストの "0" / "1" をマスの値 0 / 1 に変換する表
+_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def parse_row(line) -> bytes:
+    """テキストの1行 ("1 0 1" や "101"、str / bytes) を 1 マス 1 バイトの bytes にする"""
+    if isinstance(line, str):
+        line = line.encode()
+    row = b"".join(line.split())
+    if row.translate(None, b"01"):
+        raise ValueError(f"0 / 1 以外の文字が含まれています: {line!r}")
+    return row.translate(_DIGITS)
+
+
+def read_rows(file):
+    """"h w" の行に続く h 行を読み、各行を 1 マス 1 バイトの bytes として1行ずつ返すジェネレータ
+
+    file はテキスト・バイナリどちらのモードのファイルでもよい。
+    """
+    header = file.readline().split()
+    if len(header) != 2:
+        raise ValueError(f"1 行目は 'h w' の形式です: {header!r}")
+    h, w = map(int, header)
+    for x in range(h):
+        line = file.readline()
+        if not line:
+            raise ValueError(f"{h} 行のはずが {x} 行しかありません")
+        row = parse_row(line)
+        if len(row) != w:
+            raise ValueError(f"{x + 1} 行目の長さ {len(row)} が w = {w} と一致しません")
+        yield row
+
+
+def _as_row(row) -> bytes:
+    if isinstance(row, str):
+        return parse_row(row)
+    if isinstance(row, (bytes, bytearray)):
+        return row
+    return bytes(row)
+
+
+def count_islands_streaming(rows) -> int:
+    """1行ずつ与えられるグリッドの島 (上下左右でつながった 1) の数を返す
+
+    rows: 各行の反復可能オブジェクト (ジェネレータでよい)。各行は 0 / 1 の bytes・リスト、
+          またはテキストの行 (str)。ファイルオブジェクトを渡すと read_rows で "h w" の行から読む。
+    get_island_count と同じ数を返す。
+    """
+    if hasattr(rows, "readline"):
+        rows = read_rows(rows)
+
+    count = 0
+    prev = []  # 直前の行のラン: (左端, 右端 (含まない), 島の番号)
+    islands = 0  # 直前の行で閉じていない島の数 (島の番号は 0 .. islands - 1)
+    for row in rows:
+        row = _as_row(row)
+        end = len(row)
+
+        # 0 .. islands - 1 は直前の行の島、それ以降は今の行のラン
+        sets = DisjointSet(islands)
+        current = []
+        j = 0
+        i = row.find(1)
+        while i >= 0:
+            r = row.find(0, i)
+            if r < 0:
+                r = end
+            label = sets.make_set()
+            while j < len(prev) and prev[j][1] <= i:
+                j += 1
+            m = j
+            while m < len(prev) and prev[m][0] < r:
+                sets.union(label, prev[m][2])
+                m += 1
+            current.append((i, r, label))
+            if r == end:
+                break
+            i = row.find(1, r)
+
+        # 今の行のランとつながらなかった島はここで閉じる
+        find = sets.find
+        numbers = {}
+        for k, (left, right, label) in enumerate(current):
+            current[k] = (left, right, numbers.setdefault(find(label), len(numbers)))
+        count += len({find(label) for label in range(islands)} - numbers.keys())
+        prev, islands = current, len(numbers)
+
+    return count + islands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", help="入力ファイル (省略すると標準入力)")
+    args = parser.parse_args()
+    if args.input is None:
+        print(count_islands_streaming(sys.stdin))
+        return
+    with open(args.input, "rb") as f:
+        print(count_islands_streaming(f))
+
+
+if __name__ == "__main__":
+    main()
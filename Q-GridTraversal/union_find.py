@@ -0,0 +1,46 @@
+from array import array
+
+
+class DisjointSet:
+    """整数の配列で持つ素集合データ構造 (Union-Find)
+
+    parent は array('l')、rank は bytearray で持つので、要素あたりのメモリは 9 バイト程度。
+    find は経路圧縮、union はランクによる併合を行う。
+    """
+
+    def __init__(self, n: int = 0):
+        self.parent = array("l", range(n))
+        self.rank = bytearray(n)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def make_set(self) -> int:
+        """新しい要素を1つ追加して、その番号を返す"""
+        x = len(self.parent)
+        self.parent.append(x)
+        self.rank.append(0)
+        return x
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # 経路上の要素をすべて根に直接つなぎ直す
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        """a と b の集合を併合し、併合後の根を返す"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        rank = self.rank
+        if rank[a] < rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if rank[a] == rank[b]:
+            rank[a] += 1
+        return a
@@ -0,0 +1,416 @@
+"""min-cost-path の各実装のベンチマーク
+
+使い方:
+    python benchmark.py engine --sizes 1000 2000 5000
+    python benchmark.py queue --sizes 500 1000 --kinds random bimodal churn
+    python benchmark.py single --sizes 300 1000 --kinds open random
+    python benchmark.py router --size 300 --queries 1000 --sources 10
+    python benchmark.py parallel --size 500 --sources 200 --processes 1 2 4 8
+    python benchmark.py load --sizes 1000 2000 5000
+    python benchmark.py dynamic --size 300 --updates 100
+    python benchmark.py path --sizes 300 1000
+    python benchmark.py neighborhood --sizes 300 1000
+    python benchmark.py field --sizes 300 1000 --kinds random bimodal maze
+    python benchmark.py scaling --sizes 250 500 1000 2000 --save scaling.json
+    python benchmark.py scaling --sizes 250 500 1000 2000 --baseline scaling.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from binary_grid import convert_text, load_binary
+from dial import prefers_dial
+from dynamic import DynamicGrid
+from flat_dijkstra import distance_field, min_cost_flat
+from flat_grid import FlatGrid, np
+from generate import GRID_KINDS, random_grid, write_text_grid
+from loader import read_grid
+from main import FLAT_ENGINES, min_cost
+from neighborhood import EIGHT_NEIGHBORS, FOUR_NEIGHBORS, OCTILE, PaddedGrid, min_cost_general
+from parallel import min_cost_many
+from paths import min_cost_path
+from router import GridRouter
+from wavefront import distance_field_numpy
+
+
+def measure(func, *args, memory=True):
+    """func(*args) の (結果, 実行時間[秒], ピークメモリ[MB]) を返す
+
+    時間は tracemalloc なしで計測し、memory=True ならもう一度 tracemalloc 下で実行してピークを測る。
+    """
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_row(cells, widths):
+    return "  ".join(str(c).rjust(wd) for c, wd in zip(cells, widths))
+
+
+def bench_engine(args):
+    """従来の heap 実装と flat 実装の時間とメモリ(グリッドの表現を作るところから)を比べる"""
+
+    def run_heap(grid, start, end):
+        return min_cost(grid.rows(), start, end, "heap")
+
+    def run_flat(grid, start, end):
+        return min_cost(FlatGrid(grid.h, grid.w, array("l", grid.cells)), start, end, "flat")
+
+    runners = {"flat": run_flat}
+    if not args.skip_heap:
+        runners = {"heap": run_heap, **runners}
+
+    widths = (6, 8, 14, 10, 10)
+    print(format_row(("size", "engine", "cost", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        grid = random_grid(size, size, args.max_cost, args.seed)
+        start, end = (0, 0), (size - 1, size - 1)
+        answers = set()
+        for name, run in runners.items():
+            cost, elapsed, peak = measure(run, grid, start, end, memory=not args.no_memory)
+            answers.add(cost)
+            peak = "-" if peak is None else f"{peak:.1f}"
+            print(format_row((size, name, cost, f"{elapsed:.2f}", peak), widths))
+        assert len(answers) == 1, f"engine によって結果が異なります: {answers}"
+
+
+def bench_queue(args):
+    """ヒープ(flat)とバケツキュー(dial)を比べ、auto がどちらを選ぶかも表示する"""
+    widths = (6, 8, 8, 14, 10, 6)
+    print(format_row(("size", "kind", "engine", "cost", "time[s]", "auto"), widths))
+    for kind in args.kinds:
+        for size in args.sizes:
+            grid = GRID_KINDS[kind](size, size, args.max_cost, args.seed)
+            start, end = (0, 0), (size - 1, size - 1)
+            auto = "dial" if prefers_dial(grid) else "flat"
+            answers = set()
+            for engine in ("flat", "dial"):
+                cost, elapsed, _ = measure(min_cost, grid, start, end, engine, memory=False)
+                answers.add(cost)
+                print(format_row((size, kind, engine, cost, f"{elapsed:.2f}", "*" if engine == auto else ""), widths))
+            assert len(answers) == 1, f"engine によって結果が異なります: {answers}"
+
+
+def bench_single(args):
+    """1組の start / end に対する flat, astar, bidirectional の展開マス数と時間を比べる"""
+    widths = (6, 8, 14, 14, 10, 10)
+    print(format_row(("size", "kind", "engine", "cost", "expanded", "time[s]"), widths))
+    for kind in args.kinds:
+        for size in args.sizes:
+            grid = GRID_KINDS[kind](size, size, args.max_cost, args.seed)
+            if args.query == "corner":
+                start, end = (0, 0), (size - 1, size - 1)
+            else:
+                # 同じ行の2点: 角から角へのクエリと違い、最短経路の候補がグリッド全体に広がらない
+                start, end = (size // 2, size // 8), (size // 2, size - 1 - size // 8)
+            answers = set()
+            for engine in ("flat", "astar", "bidirectional"):
+                stats = {}
+                cost, elapsed, _ = measure(FLAT_ENGINES[engine], grid, start, end, stats, memory=False)
+                answers.add(cost)
+                print(format_row((size, kind, engine, cost, stats["expanded"], f"{elapsed:.2f}"), widths))
+            assert len(answers) == 1, f"engine によって結果が異なります: {answers}"
+
+
+def bench_router(args):
+    """同じグリッドへの多数のクエリを、1件ずつの min_cost と GridRouter.query_many で比べる"""
+    size = args.size
+    grid = random_grid(size, size, args.max_cost, args.seed)
+    rnd = random.Random(args.seed)
+    sources = [(rnd.randrange(size), rnd.randrange(size)) for _ in range(args.sources)]
+    queries = [(rnd.choice(sources), (rnd.randrange(size), rnd.randrange(size))) for _ in range(args.queries)]
+
+    router = GridRouter(grid, maxsize=args.maxsize)
+    answers, elapsed, _ = measure(router.query_many, queries, memory=False)
+    print(f"GridRouter.query_many: {elapsed:.2f}s  {router.cache_info()}  grouped={router.grouped}")
+
+    n = min(args.queries, args.baseline_queries)
+    expected, elapsed, _ = measure(lambda: [min_cost(grid, s, e, "flat") for s, e in queries[:n]], memory=False)
+    print(f"min_cost x {n}: {elapsed:.2f}s (x {args.queries} 件換算 {elapsed * args.queries / n:.2f}s)")
+    assert answers[:n] == expected, "GridRouter と min_cost の結果が異なります"
+
+
+def bench_parallel(args):
+    """多数の始点からのクエリを min_cost_many で解き、プロセス数ごとの時間とスケーリングを表示する"""
+    size = args.size
+    grid = random_grid(size, size, args.max_cost, args.seed)
+    rnd = random.Random(args.seed)
+    queries = [((rnd.randrange(size), rnd.randrange(size)), (size - 1, size - 1)) for _ in range(args.sources)]
+
+    widths = (10, 10, 10)
+    print(format_row(("processes", "time[s]", "speedup"), widths))
+    expected = base = None
+    for processes in args.processes:
+        answers, elapsed, _ = measure(lambda: list(min_cost_many(grid, queries, processes)), memory=False)
+        if expected is None:
+            expected, base = answers, elapsed
+        assert answers == expected, "プロセス数によって結果が異なります"
+        print(format_row((processes, f"{elapsed:.2f}", f"{base / elapsed:.2f}"), widths))
+
+
+def bench_load(args):
+    """1行ずつの input() 相当の読み込み、read_grid、load_binary の読み込み時間を比べる"""
+
+    def read_lines(path):
+        with open(path) as f:
+            h, w = map(int, f.readline().split())
+            return [list(map(int, f.readline().split())) for _ in range(h)]
+
+    loaders = {"lines": read_lines, "array": lambda path: read_grid(path, "array")}
+    if np is not None:
+        loaders["numpy"] = lambda path: read_grid(path, "numpy")
+    # バイナリ形式は mmap するだけなので、読み込み時間はセル数にほぼよらない
+    loaders["binary"] = lambda path: load_binary(path[:-len(".txt")] + ".bin")
+
+    widths = (6, 8, 10, 10)
+    print(format_row(("size", "loader", "time[s]", "peak[MB]"), widths))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = f"{tmp}/grid{size}.txt"
+            grid = random_grid(size, size, args.max_cost, args.seed)
+            write_text_grid(path, grid)
+            convert_text(path, f"{tmp}/grid{size}.bin", "h")
+            expected = grid.rows()
+            for name, load in loaders.items():
+                loaded, elapsed, peak = measure(load, path, memory=not args.no_memory)
+                rows = loaded if name == "lines" else loaded.rows()
+                assert rows == expected, f"{name} の読み込み結果が異なります"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, name, f"{elapsed:.2f}", peak), widths))
+
+
+def bench_dynamic(args):
+    """ランダムな1マスの更新とクエリを繰り返し、DynamicGrid と毎回の再計算を比べる"""
+    size = args.size
+    grid = random_grid(size, size, args.max_cost, args.seed)
+    rnd = random.Random(args.seed)
+    updates = [(rnd.randrange(size), rnd.randrange(size), rnd.randint(1, args.max_cost)) for _ in range(args.updates)]
+    start, end = (0, 0), (size - 1, size - 1)
+
+    def run_dynamic():
+        dynamic = DynamicGrid(grid, start)
+        dynamic.query(end)
+        answers = []
+        for x, y, cost in updates:
+            dynamic.update_cell(x, y, cost)
+            answers.append(dynamic.query(end))
+        return answers, dynamic.processed
+
+    def run_full():
+        current = FlatGrid(size, size, array("l", grid.cells))
+        answers = []
+        for x, y, cost in updates:
+            current.cells[x * size + y] = cost
+            answers.append(min_cost_flat(current, start, end))
+        return answers
+
+    (answers, processed), elapsed, _ = measure(run_dynamic, memory=False)
+    print(f"DynamicGrid: {elapsed:.2f}s (修復したマス 延べ {processed}, 最初のクエリを含む)")
+    expected, elapsed, _ = measure(run_full, memory=False)
+    print(f"再計算     : {elapsed:.2f}s")
+    assert answers == expected, "DynamicGrid と再計算の結果が異なります"
+
+
+def bench_path(args):
+    """経路と経路数も求める min_cost_path と、コストだけ求める flat の時間とメモリを比べる"""
+    widths = (6, 14, 10, 10, 10)
+    print(format_row(("size", "engine", "time[s]", "peak[MB]", "ratio"), widths))
+    for size in args.sizes:
+        grid = random_grid(size, size, args.max_cost, args.seed)
+        start, end = (0, 0), (size - 1, size - 1)
+        cost, base, peak = measure(min_cost_flat, grid, start, end, memory=not args.no_memory)
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(format_row((size, "flat", f"{base:.2f}", peak, "1.00"), widths))
+        (path_cost, _, _), elapsed, peak = measure(min_cost_path, grid, start, end, memory=not args.no_memory)
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(format_row((size, "min_cost_path", f"{elapsed:.2f}", peak, f"{elapsed / base:.2f}"), widths))
+        assert cost == path_cost, "min_cost_path のコストが異なります"
+
+
+def bench_neighborhood(args):
+    """従来の4近傍のループ (flat) と、番兵で囲んだ PaddedGrid 上の min_cost_general のスループットを比べる"""
+    neighborhoods = {"four": FOUR_NEIGHBORS, "eight": EIGHT_NEIGHBORS, "octile": OCTILE}
+    widths = (6, 8, 14, 10, 14)
+    print(format_row(("size", "model", "cost", "time[s]", "cells/s"), widths))
+    for size in args.sizes:
+        grid = random_grid(size, size, args.max_cost, args.seed)
+        padded = PaddedGrid(grid)
+        start, end = (0, 0), (size - 1, size - 1)
+        n = size * size
+        cost, elapsed, _ = measure(min_cost_flat, grid, start, end, memory=False)
+        print(format_row((size, "flat", cost, f"{elapsed:.2f}", f"{n / elapsed:,.0f}"), widths))
+        for name, neighborhood in neighborhoods.items():
+            general, elapsed, _ = measure(min_cost_general, padded, start, end, neighborhood, memory=False)
+            print(format_row((size, name, general, f"{elapsed:.2f}", f"{n / elapsed:,.0f}"), widths))
+            if name == "four":
+                assert general == cost, "4近傍の結果が flat と異なります"
+
+
+def bench_field(args):
+    """全マスへの距離を、ヒープのダイクストラ法 (distance_field) と numpy の一括緩和で求めて比べる"""
+    if np is None:
+        raise SystemExit("field には numpy が必要です")
+    widths = (6, 10, 10, 10, 12)
+    print(format_row(("size", "kind", "heap[s]", "numpy[s]", "iterations"), widths))
+    for kind in args.kinds:
+        for size in args.sizes:
+            grid = GRID_KINDS[kind](size, size, args.max_cost, args.seed)
+            expected, heap_time, _ = measure(distance_field, grid, (0, 0), memory=False)
+            stats = {}
+            dist, numpy_time, _ = measure(distance_field_numpy, grid, (0, 0), stats, memory=False)
+            assert np.array_equal(np.asarray(expected).reshape(size, size), dist), "numpy 版の距離が異なります"
+            print(format_row((size, kind, f"{heap_time:.2f}", f"{numpy_time:.2f}", stats["iterations"]), widths))
+
+
+def fit_power_law(ns, times):
+    """time = a * n^b を log-log の最小二乗で当てはめ、(a, b) を返す"""
+    xs = [math.log(n) for n in ns]
+    ys = [math.log(max(t, 1e-9)) for t in times]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    b = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+    return math.exp(my - b * mx), b
+
+
+def bench_scaling(args):
+    """サイズを大きくしながら min_cost を計測し、計算量の曲線を当てはめて以前の結果からの悪化を検出する
+
+    n = h * w に対する指数 b (time ∝ n^b) と、n log n あたりの時間を表示する。
+    --baseline に以前の --save の結果を渡すと、同じサイズで時間が tolerance を超えて増えたか、
+    指数が 0.15 以上増えた engine / kind を REGRESSION として報告し、終了コード 1 を返す。
+    """
+    results = {}
+    widths = (10, 8, 6, 12, 10, 14)
+    print(format_row(("kind", "engine", "size", "cells", "time[s]", "ns/(n log n)"), widths))
+    for kind in args.kinds:
+        for engine in args.engines:
+            ns, times = [], []
+            for size in args.sizes:
+                grid = GRID_KINDS[kind](size, size, args.max_cost, args.seed)
+                n = size * size
+                best = min(
+                    measure(min_cost, grid, (0, 0), (size - 1, size - 1), engine, memory=False)[1]
+                    for _ in range(args.repeat)
+                )
+                ns.append(n)
+                times.append(best)
+                per = best / (n * math.log2(n)) * 1e9
+                print(format_row((kind, engine, size, n, f"{best:.3f}", f"{per:.1f}"), widths))
+            a, b = fit_power_law(ns, times)
+            print(f"  -> {kind}/{engine}: time ≈ {a:.3g} * n^{b:.2f}")
+            results[f"{kind}/{engine}"] = {"sizes": args.sizes, "times": times, "exponent": b}
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = []
+        for key, current in results.items():
+            base = baseline.get(key)
+            if base is None:
+                continue
+            base_times = dict(zip(base["sizes"], base["times"]))
+            for size, t in zip(current["sizes"], current["times"]):
+                if size in base_times and t > base_times[size] * (1 + args.tolerance):
+                    regressions.append(f"{key} size={size}: {base_times[size]:.3f}s -> {t:.3f}s")
+            if current["exponent"] > base["exponent"] + 0.15:
+                regressions.append(f"{key}: exponent {base['exponent']:.2f} -> {current['exponent']:.2f}")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+        print("regression なし")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-cost", type=int, default=1000)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc によるメモリ計測を省略する")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("engine", help="heap 実装と flat 実装の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000])
+    p.add_argument("--skip-heap", action="store_true", help="大きいサイズで従来実装を省略する")
+    p.set_defaults(func=bench_engine)
+
+    p = sub.add_parser("queue", help="ヒープとバケツキューの比較 (--max-cost を大きくすると dial に不利になる)")
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 1000])
+    p.add_argument("--kinds", nargs="+", choices=list(GRID_KINDS), default=["random", "bimodal"])
+    p.set_defaults(func=bench_queue)
+
+    p = sub.add_parser("single", help="A* / 双方向ダイクストラ法とダイクストラ法の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 1000])
+    p.add_argument("--kinds", nargs="+", choices=list(GRID_KINDS), default=["open", "random"])
+    p.add_argument("--query", choices=["row", "corner"], default="row")
+    p.set_defaults(func=bench_single)
+
+    p = sub.add_parser("router", help="GridRouter による複数クエリの一括処理")
+    p.add_argument("--size", type=int, default=300)
+    p.add_argument("--queries", type=int, default=1000)
+    p.add_argument("--sources", type=int, default=10)
+    p.add_argument("--maxsize", type=int, default=16)
+    p.add_argument("--baseline-queries", type=int, default=50, help="min_cost で実際に解くクエリ数")
+    p.set_defaults(func=bench_router)
+
+    p = sub.add_parser("parallel", help="min_cost_many のプロセス数によるスケーリング")
+    p.add_argument("--size", type=int, default=500)
+    p.add_argument("--sources", type=int, default=200)
+    p.add_argument("--processes", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    p.set_defaults(func=bench_parallel)
+
+    p = sub.add_parser("load", help="テキスト入力とバイナリ形式の読み込み時間")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000])
+    p.set_defaults(func=bench_load)
+
+    p = sub.add_parser("dynamic", help="DynamicGrid による差分更新と再計算の比較")
+    p.add_argument("--size", type=int, default=300)
+    p.add_argument("--updates", type=int, default=100)
+    p.set_defaults(func=bench_dynamic)
+
+    p = sub.add_parser("path", help="経路復元・経路数えあげのオーバーヘッド")
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 1000])
+    p.set_defaults(func=bench_path)
+
+    p = sub.add_parser("neighborhood", help="近傍モデルごとのスループット")
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 1000])
+    p.set_defaults(func=bench_neighborhood)
+
+    p = sub.add_parser("field", help="全マスへの距離: ヒープと numpy の一括緩和の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[300, 1000])
+    p.add_argument("--kinds", nargs="+", choices=list(GRID_KINDS), default=["random", "bimodal", "churn"])
+    p.set_defaults(func=bench_field)
+
+    p = sub.add_parser("scaling", help="サイズに対する計算量の曲線と性能の悪化の検出")
+    p.add_argument("--sizes", type=int, nargs="+", default=[125, 250, 500, 1000])
+    p.add_argument("--kinds", nargs="+", choices=list(GRID_KINDS), default=["random"])
+    p.add_argument("--engines", nargs="+", choices=["heap", *FLAT_ENGINES], default=["flat"])
+    p.add_argument("--repeat", type=int, default=3, help="各サイズで計測する回数 (最小値を使う)")
+    p.add_argument("--save", help="結果を書き出す JSON のパス")
+    p.add_argument("--baseline", help="比較する以前の結果の JSON のパス")
+    p.add_argument("--tolerance", type=float, default=0.25, help="時間の増加をどこまで許すか (0.25 = 25%%)")
+    p.set_defaults(func=bench_scaling)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""コストグリッドのバイナリ形式
+
+    ヘッダ (24 バイト, リトルエンディアン): magic b"MCPG", 型コード 1 バイト, 予約 3 バイト, h (uint64), w (uint64)
+    本体: h * w 個のセルを行優先でリトルエンディアンの整数として並べたもの
+
+型コードは array モジュールの 'h' (int16) / 'i' (int32) / 'q' (int64)。
+
+使い方 (テキスト形式からの変換):
+    python binary_grid.py case.txt case.bin [--typecode h]
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+from flat_grid import FlatGrid, np
+from loader import iter_int_chunks, parse_header
+
+MAGIC = b"MCPG"
+HEADER = struct.Struct("<4sc3xQQ")
+ITEMSIZES = {"h": 2, "i": 4, "q": 8}
+
+
+def is_binary_grid(path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(path, grid: FlatGrid, typecode="i"):
+    """grid をバイナリ形式で書き出す"""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, typecode.encode(), grid.h, grid.w))
+        if np is not None and isinstance(grid.cells, np.ndarray):
+            _write_cells(f, grid.cells, typecode)
+            return
+        # array(typecode, memoryview) は生のバイト列として解釈されるので、int のリストに直して渡す
+        cells = grid.view()
+        for k in range(0, len(cells), 1 << 20):
+            _write_cells(f, cells[k:k + (1 << 20)].tolist(), typecode)
+
+
+def convert_text(src, dst, typecode="i"):
+    """README のテキスト形式のファイル src をバイナリ形式の dst に変換する
+
+    テキストは mmap して少しずつ変換するので、全体をメモリに載せない。
+    """
+    with open(src, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf, open(dst, "wb") as out:
+        h, w, offset = parse_header(buf)
+        out.write(HEADER.pack(MAGIC, typecode.encode(), h, w))
+        k = 0
+        for values in iter_int_chunks(buf, offset, "array" if np is None else "numpy"):
+            _write_cells(out, values, typecode)
+            k += len(values)
+    if k != h * w:
+        raise ValueError(f"セルの数 {k} が h * w = {h * w} と一致しません")
+
+
+def load_binary(path) -> FlatGrid:
+    """バイナリ形式のファイルを mmap し、コピーせずに FlatGrid として返す
+
+    セルは memoryview 越しに参照するので、探索で触れたページだけが読み込まれる。
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, typecode, h, w = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError(f"{path} はバイナリ形式のグリッドではありません")
+    typecode = typecode.decode()
+    if typecode not in ITEMSIZES:
+        raise ValueError(f"unknown typecode: {typecode}")
+    end = HEADER.size + h * w * ITEMSIZES[typecode]
+    if len(buf) < end:
+        raise ValueError(f"{path} のセルが足りません")
+
+    if sys.byteorder == "little":
+        cells = memoryview(buf)[HEADER.size:end].cast(typecode)
+    else:  # ビッグエンディアン環境ではコピーしてバイト順を入れ替える
+        cells = array(typecode, buf[HEADER.size:end])
+        cells.byteswap()
+    return FlatGrid(h, w, cells)
+
+
+def _write_cells(f, values, typecode):
+    """整数列をリトルエンディアンの typecode 型で f に書く (範囲外の値は OverflowError)"""
+    if np is not None and isinstance(values, np.ndarray):
+        info = np.iinfo(f"<i{ITEMSIZES[typecode]}")
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            raise OverflowError(f"typecode '{typecode}' に収まらない値があります")
+        f.write(values.astype(f"<i{ITEMSIZES[typecode]}").tobytes())
+        return
+    cells = array(typecode, values)
+    if sys.byteorder == "big":
+        cells.byteswap()
+    f.write(cells.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("src", help="テキスト形式の入力ファイル")
+    parser.add_argument("dst", help="バイナリ形式の出力ファイル")
+    parser.add_argument("--typecode", choices=list(ITEMSIZES), default="i")
+    args = parser.parse_args()
+    convert_text(args.src, args.dst, args.typecode)
+
+
+if __name__ == "__main__":
+    main()
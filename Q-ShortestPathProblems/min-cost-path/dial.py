@@ -0,0 +1,82 @@
+from array import array
+
+from flat_dijkstra import INF, min_cost_flat
+from flat_grid import FlatGrid
+
+# 最大コスト C * (h + w) がマス数のこの倍以下なら、空バケツの走査よりヒープの log が重いとみなす
+DIAL_RATIO = 8
+
+
+def min_cost_dial(grid: FlatGrid, start, end):
+    """min_cost と同じ値を、バケツキュー(Dial のアルゴリズム)で求める
+
+    マスのコストが 1 <= t <= C の整数なので、未確定の距離は常に [d, d + C] に収まる。
+    C + 1 個のバケツを循環させて距離ごとにマスを入れれば、push / pop は O(1) になる。
+    """
+    w = grid.w
+    n = len(grid)
+    cells = grid.view()
+    s = start[0] * w + start[1]
+    t = end[0] * w + end[1]
+    size = grid.max_cost() + 1
+
+    dist = array("q", [INF]) * n
+    dist[s] = cost = cells[s]
+    buckets = [[] for _ in range(size)]
+    buckets[cost % size].append(s)
+    pending = 1  # バケツに入っている(古いものを含む)エントリ数
+
+    while pending:
+        while not buckets[cost % size]:
+            cost += 1
+        # 取り出したバケツは空のリストと差し替える (コスト 0 のマスで同じ距離に積まれても次の周回で拾える)
+        k = cost % size
+        bucket, buckets[k] = buckets[k], []
+        pending -= len(bucket)
+        for i in bucket:
+            if dist[i] != cost:
+                continue
+            if i == t:
+                return cost
+
+            y = i % w
+            if y + 1 < w:
+                j = i + 1
+                c = cost + cells[j]
+                if c < dist[j]:
+                    dist[j] = c
+                    buckets[c % size].append(j)
+                    pending += 1
+            j = i + w
+            if j < n:
+                c = cost + cells[j]
+                if c < dist[j]:
+                    dist[j] = c
+                    buckets[c % size].append(j)
+                    pending += 1
+            if y:
+                j = i - 1
+                c = cost + cells[j]
+                if c < dist[j]:
+                    dist[j] = c
+                    buckets[c % size].append(j)
+                    pending += 1
+            j = i - w
+            if j >= 0:
+                c = cost + cells[j]
+                if c < dist[j]:
+                    dist[j] = c
+                    buckets[c % size].append(j)
+                    pending += 1
+
+
+def prefers_dial(grid: FlatGrid) -> bool:
+    """最大コストがグリッドの大きさに対して小さく、バケツキューの方が速いと見込めるか"""
+    return grid.max_cost() * (grid.h + grid.w) <= DIAL_RATIO * len(grid)
+
+
+def min_cost_auto(grid: FlatGrid, start, end):
+    """prefers_dial に従って dial と flat(ヒープ) を選んで解く"""
+    if prefers_dial(grid):
+        return min_cost_dial(grid, start, end)
+    return min_cost_flat(grid, start, end)
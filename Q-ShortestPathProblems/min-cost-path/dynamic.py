@@ -0,0 +1,85 @@
+import heapq
+from array import array
+
+from flat_dijkstra import INF
+from flat_grid import as_flat_grid
+from single_pair import neighbors
+
+
+class DynamicGrid:
+    """マスのコストが少しずつ変わるグリッドで、start からの最小コストを差分更新しながら答える
+
+    LPA* (ヒューリスティック 0) と同じく、各マスに
+        g   : 現在の距離の推定値
+        rhs : 近傍の g から1歩で計算した値 (rhs[v] = t_v + min(g[u]), rhs[start] = t_start)
+    を持ち、g != rhs の不整合なマスだけを min(g, rhs) の小さい順に直す。
+    ヒューリスティックが 0 なのでキーが終点によらず、キューを別の終点へのクエリでも使い回せる。
+    """
+
+    def __init__(self, grid, start):
+        grid = as_flat_grid(grid)
+        self.h, self.w = grid.h, grid.w
+        n = self.h * self.w
+        self.cells = array("q", grid.view())
+        self.start = grid.index(*start)
+        self.g = array("q", [INF]) * n
+        self.rhs = array("q", [INF]) * n
+        self.rhs[self.start] = self.cells[self.start]
+        self._pq = [self.rhs[self.start] * n + self.start]
+        self.processed = 0  # 直したマスの延べ数 (ベンチマーク用)
+
+    def update_cell(self, x, y, cost):
+        """マス (x, y) のコストを cost に変える (None なら通れないマスにする)
+
+        変わるのは (x, y) に入る辺の重みだけなので、(x, y) の rhs を計算し直せばよい。
+        実際の修復は次のクエリで必要な範囲だけ行う。
+        """
+        v = x * self.w + y
+        self.cells[v] = INF if cost is None else cost
+        self._update_vertex(v)
+
+    def query(self, end):
+        """start から end までの最小コストを返す (到達できなければ None)"""
+        t = end[0] * self.w + end[1]
+        self._compute(t)
+        return None if self.g[t] == INF else self.g[t]
+
+    def distances(self) -> array:
+        """すべての不整合を直し、start から各マスへの距離の array('q') を返す (到達不能は INF)"""
+        self._compute(-1)
+        return self.g
+
+    def _update_vertex(self, v):
+        g, rhs, cells = self.g, self.rhs, self.cells
+        if v == self.start:
+            r = cells[v]
+        elif cells[v] == INF:
+            r = INF
+        else:
+            r = min(g[u] for u in neighbors(v, self.h, self.w))
+            r = INF if r == INF else r + cells[v]
+        rhs[v] = r
+        if g[v] != r:
+            heapq.heappush(self._pq, min(g[v], r) * len(g) + v)
+
+    def _compute(self, t):
+        """キューの先頭が t のキーより小さいか t が不整合な間、マスを直す (t = -1 なら全部)"""
+        g, rhs, pq = self.g, self.rhs, self._pq
+        n = len(g)
+        h, w = self.h, self.w
+        while pq:
+            key, u = divmod(pq[0], n)
+            if g[u] == rhs[u] or min(g[u], rhs[u]) != key:
+                heapq.heappop(pq)  # 古いエントリ
+                continue
+            if t >= 0 and g[t] == rhs[t] and key >= min(g[t], rhs[t]):
+                break
+            heapq.heappop(pq)
+            self.processed += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+            else:
+                g[u] = INF
+                self._update_vertex(u)
+            for v in neighbors(u, h, w):
+                self._update_vertex(v)
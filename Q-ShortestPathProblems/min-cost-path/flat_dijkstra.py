@@ -0,0 +1,79 @@
+import heapq
+from array import array
+
+from flat_grid import FlatGrid
+
+# 距離の初期値 (float('inf') の代わりに使う番兵)
+INF = (1 << 63) - 1
+
+
+def min_cost_flat(grid: FlatGrid, start, end, stats=None):
+    """min_cost と同じ値を、1次元バッファ上のダイクストラ法で求める
+
+    - グリッドと距離を array / numpy の連続バッファで持ち、マスは index = x * w + y で表す
+    - ヒープには (cost, x, y) のタプルではなく cost * n + index の1つの整数を積む
+    - decrease-key の代わりに積み直し、取り出した古いエントリは読み飛ばす
+
+    stats に dict を渡すと、展開(確定)したマスの数を stats["expanded"] に入れる。
+    """
+    dist = distance_field(grid, start, end, stats)
+    cost = dist[end[0] * grid.w + end[1]]
+    return None if cost == INF else cost
+
+
+def distance_field(grid: FlatGrid, start, end=None, stats=None) -> array:
+    """start から各マスまでの最小コストを index 順に並べた array('q') を返す
+
+    end を指定すると end が確定した時点で打ち切る (end 以外の値は暫定値になる)。
+    到達できないマスは INF のまま。
+    """
+    w = grid.w
+    n = len(grid)
+    cells = grid.view()
+    s = start[0] * w + start[1]
+    t = -1 if end is None else end[0] * w + end[1]
+
+    dist = array("q", [INF]) * n
+    dist[s] = cells[s]
+    pq = [cells[s] * n + s]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    expanded = 0
+
+    while pq:
+        cost, i = divmod(heappop(pq), n)
+        if cost > dist[i]:
+            continue
+        expanded += 1
+        if i == t:
+            break
+
+        # 右・下・左・上の順に緩和する (範囲外は index と列番号で判定)
+        y = i % w
+        if y + 1 < w:
+            j = i + 1
+            c = cost + cells[j]
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, c * n + j)
+        j = i + w
+        if j < n:
+            c = cost + cells[j]
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, c * n + j)
+        if y:
+            j = i - 1
+            c = cost + cells[j]
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, c * n + j)
+        j = i - w
+        if j >= 0:
+            c = cost + cells[j]
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, c * n + j)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return dist
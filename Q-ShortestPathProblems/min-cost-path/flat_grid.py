@@ -0,0 +1,75 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy が無い環境では array('l') のみを使う
+    np = None
+
+
+class FlatGrid:
+    """h x w のグリッドを1次元の整数バッファで保持する
+
+    マス (x, y) は index = x * w + y の1つの整数で表す。
+    cells は array('l') / numpy の整数配列 / memoryview など、添字で int を返す連続バッファであればよい。
+    """
+
+    def __init__(self, h: int, w: int, cells):
+        if len(cells) != h * w:
+            raise ValueError(f"cells の長さ {len(cells)} が h * w = {h * w} と一致しません")
+        self.h = h
+        self.w = w
+        self.cells = cells
+
+    @classmethod
+    def from_rows(cls, rows, backend: str = "array"):
+        """リストのリスト形式のグリッドから FlatGrid を作る
+
+        backend: "array" なら array('l')、"numpy" なら numpy.int64 の配列を使う
+        """
+        h, w = len(rows), len(rows[0])
+        if backend == "numpy":
+            if np is None:
+                raise ImportError("backend='numpy' には numpy が必要です")
+            cells = np.asarray(rows, dtype=np.int64).reshape(-1)
+        elif backend == "array":
+            cells = array("l")
+            for row in rows:
+                cells.extend(row)
+        else:
+            raise ValueError(f"unknown backend: {backend}")
+        return cls(h, w, cells)
+
+    def __len__(self):
+        return self.h * self.w
+
+    def index(self, x: int, y: int) -> int:
+        return x * self.w + y
+
+    def position(self, i: int) -> tuple[int, int]:
+        return divmod(i, self.w)
+
+    def max_cost(self) -> int:
+        if np is not None and isinstance(self.cells, np.ndarray):
+            return int(self.cells.max())
+        return max(self.cells)
+
+    def min_cost(self) -> int:
+        if np is not None and isinstance(self.cells, np.ndarray):
+            return int(self.cells.min())
+        return min(self.cells)
+
+    def view(self) -> memoryview:
+        """探索ループ用に、要素アクセスで int を返すゼロコピーのビューを返す"""
+        return memoryview(self.cells)
+
+    def rows(self) -> list[list[int]]:
+        """リストのリスト形式に戻す"""
+        cells, w = self.view(), self.w
+        return [list(cells[x * w:(x + 1) * w]) for x in range(self.h)]
+
+
+def as_flat_grid(grid, backend: str = "array") -> FlatGrid:
+    """FlatGrid はそのまま、リストのリストは FlatGrid に変換して返す"""
+    if isinstance(grid, FlatGrid):
+        return grid
+    return FlatGrid.from_rows(grid, backend)
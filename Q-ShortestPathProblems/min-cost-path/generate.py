@@ -0,0 +1,155 @@
+"""min-cost-path の大きなテストケースを乱数シード付きで生成する
+
+testcase/caseN.txt と、参照解の testcase/answerN.txt を書き出す。
+参照解は従来の heap 実装 (main.min_cost の engine="heap") で求める。flat エンジンの値とも突き合わせ、
+異なれば書き出さずにエラーにする (flat は判定される側のエンジンなので、それだけを参照解にはしない)。
+
+使い方:
+    python generate.py --kind maze --size 1000 1000 --seed 1 [--number 2] [--max-cost 1000]
+"""
+
+import argparse
+import random
+import re
+from array import array
+from pathlib import Path
+
+from flat_dijkstra import min_cost_flat
+from flat_grid import FlatGrid
+from main import min_cost
+
+HERE = Path(__file__).resolve().parent
+
+
+def random_grid(h, w, max_cost=1000, seed=0) -> FlatGrid:
+    """1 <= t <= max_cost の一様乱数のグリッドを作る
+
+    numpy の有無で同じ seed から違うグリッドができないよう、他の種類と同じく random.Random だけを使う
+    (randint を1マスずつ呼ぶより速い choices でまとめて引く)。
+    """
+    rnd = random.Random(seed)
+    return FlatGrid(h, w, array("l", rnd.choices(range(1, max_cost + 1), k=h * w)))
+
+
+def bimodal_grid(h, w, max_cost=1000, seed=0, ratio=0.1) -> FlatGrid:
+    """ほとんどがコスト1で、ratio の割合だけコスト max_cost の壁があるグリッドを作る
+
+    距離の値が飛び飛びになるので、バケツキューでは空バケツの走査が増える。
+    """
+    rnd = random.Random(seed)
+    return FlatGrid(h, w, array("l", [max_cost if rnd.random() < ratio else 1 for _ in range(h * w)]))
+
+
+def open_grid(h, w, max_cost=1000, seed=0) -> FlatGrid:
+    """コストの幅が狭い(max_cost の 9 割以上)開けたグリッドを作る"""
+    rnd = random.Random(seed)
+    low = max(1, max_cost * 9 // 10)
+    return FlatGrid(h, w, array("l", [rnd.randint(low, max_cost) for _ in range(h * w)]))
+
+
+def maze_grid(h, w, max_cost=1000, seed=0) -> FlatGrid:
+    """通路がコスト1、壁がコスト max_cost の迷路状のグリッドを作る
+
+    偶数座標のマスを部屋とし、穴掘り法 (明示的なスタックによる深さ優先探索) で部屋の間の壁を壊す。
+    壁も通れるので、壁を横切る近道と迷路をたどる遠回りの比較になる。
+    """
+    rnd = random.Random(seed)
+    cells = array("l", [max_cost]) * (h * w)
+    cells[0] = 1
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        candidates = [
+            (x + dx, y + dy)
+            for dx, dy in ((0, 2), (2, 0), (0, -2), (-2, 0))
+            if 0 <= x + dx < h and 0 <= y + dy < w and cells[(x + dx) * w + y + dy] != 1
+        ]
+        if not candidates:
+            stack.pop()
+            continue
+        nx, ny = rnd.choice(candidates)
+        cells[(x + nx) // 2 * w + (y + ny) // 2] = 1
+        cells[nx * w + ny] = 1
+        stack.append((nx, ny))
+    # 部屋の格子からはみ出す最終行・最終列 (h, w が偶数のとき) もゴールまでつなぐ
+    cells[h * w - 1] = 1
+    return FlatGrid(h, w, cells)
+
+
+def gradient_grid(h, w, max_cost=1000, seed=0) -> FlatGrid:
+    """左上から右下に向かってコストが 1 から max_cost まで増え、少しノイズが乗ったグリッドを作る"""
+    rnd = random.Random(seed)
+    span = max(1, h + w - 2)
+    noise = max(1, max_cost // 20)
+    cells = array("l")
+    for x in range(h):
+        for y in range(w):
+            base = 1 + (max_cost - 1) * (x + y) // span
+            cells.append(min(max_cost, max(1, base + rnd.randint(-noise, noise))))
+    return FlatGrid(h, w, cells)
+
+
+def churn_grid(h, w, max_cost=1000, seed=0) -> FlatGrid:
+    """コスト1の縦の通路とコスト max_cost の壁の列が交互に並ぶグリッドを作る (ヒープの最悪ケース)
+
+    マスのコストが入る辺の重みなので、各マスがヒープに積まれるのは1回だけで、積み直しは起きない。
+    代わりに、通路の脇の壁のマスが早い段階でまとめて積まれて最後まで残るので、ヒープが O(h * w) の大きさに保たれる。
+    乱数は、通路を偶数列と奇数列のどちらに置くかにだけ使う。
+    """
+    rnd = random.Random(seed)
+    offset = rnd.randrange(2)
+    cells = array("l", [1 if (y + offset) % 2 == 0 else max_cost for y in range(w)]) * h
+    return FlatGrid(h, w, cells)
+
+
+GRID_KINDS = {
+    "random": random_grid,
+    "bimodal": bimodal_grid,
+    "open": open_grid,
+    "maze": maze_grid,
+    "gradient": gradient_grid,
+    "churn": churn_grid,
+}
+
+
+def write_text_grid(path, grid: FlatGrid):
+    """README の入力形式で grid を書き出す"""
+    with open(path, "w") as f:
+        f.write(f"{grid.h} {grid.w}\n")
+        for row in grid.rows():
+            f.write(" ".join(map(str, row)) + "\n")
+
+
+def next_case_number(directory) -> int:
+    numbers = [int(m[1]) for p in Path(directory).glob("case*.txt") if (m := re.fullmatch(r"case(\d+)\.txt", p.name))]
+    return max(numbers, default=0) + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kind", choices=list(GRID_KINDS), default="random")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("H", "W"), default=[1000, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-cost", type=int, default=1000)
+    parser.add_argument("--out", default=str(HERE / "testcase"), help="出力先のディレクトリ")
+    parser.add_argument("--number", type=int, help="ケース番号 (省略時は既存の最大番号 + 1)")
+    args = parser.parse_args()
+
+    h, w = args.size
+    grid = GRID_KINDS[args.kind](h, w, args.max_cost, args.seed)
+    start, end = (0, 0), (h - 1, w - 1)
+    answer = min_cost(grid.rows(), start, end, "heap")
+    flat = min_cost_flat(grid, start, end)
+    if flat != answer:
+        raise SystemExit(f"heap と flat の結果が異なります: heap={answer} flat={flat}")
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    number = args.number or next_case_number(out)
+    write_text_grid(out / f"case{number}.txt", grid)
+    (out / f"answer{number}.txt").write_text(f"{answer}\n")
+    print(f"case{number}: {args.kind} {h}x{w} seed={args.seed} answer={answer}")
+
+
+if __name__ == "__main__":
+    main()
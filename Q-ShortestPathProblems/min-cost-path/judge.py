@@ -0,0 +1,136 @@
+"""testcase/case*.txt をすべて main.py で1回ずつ実行し、answer*.txt と照合する
+
+judge.sh と違い expect を使わず、テストケースをプロセスプールで並列に実行して、ケースごとの
+時間制限・メモリ制限・実行時間・最大 RSS を記録する。
+
+使い方:
+    python judge.py [--case 1] [--workers 4] [--time-limit 16] [--memory-limit 1024] [--json result.json]
+                    [-- --engine flat]
+"""
+
+import argparse
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def find_cases(directory):
+    """(番号, case のパス, answer のパス) を番号順に返す"""
+    cases = []
+    for path in Path(directory).glob("case*.txt"):
+        m = re.fullmatch(r"case(\d+)\.txt", path.name)
+        if m:
+            cases.append((int(m[1]), path, path.with_name(f"answer{m[1]}.txt")))
+    return sorted(cases)
+
+
+def run_case(number, case_path, answer_path, time_limit, memory_limit, extra_args=()):
+    """1つのテストケースを実行して結果の dict を返す
+
+    子プロセスは os.wait4 でポーリングして待ち、終了時の rusage から最大 RSS を得る。
+    時間制限を超えたら kill し、メモリ制限は RLIMIT_AS で課す。
+    (preexec_fn を安全に使えるよう、呼び出し側のプロセスではスレッドを起こさない)
+    """
+
+    def limit_memory():
+        if memory_limit:
+            size = memory_limit * 2**20
+            resource.setrlimit(resource.RLIMIT_AS, (size, size))
+
+    cmd = [sys.executable, str(HERE / "main.py"), *extra_args]
+    with open(case_path, "rb") as fin, tempfile.TemporaryFile() as fout, tempfile.TemporaryFile() as ferr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdin=fin, stdout=fout, stderr=ferr, cwd=HERE, preexec_fn=limit_memory)
+        killed = False
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if not killed and time.perf_counter() - start > time_limit:
+                proc.kill()
+                killed = True
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        fout.seek(0)
+        ferr.seek(0)
+        output = fout.read().decode().strip()
+        stderr = ferr.read().decode()
+
+    expected = answer_path.read_text().strip() if answer_path.exists() else None
+    if killed:
+        verdict = "TLE"
+    elif "MemoryError" in stderr:
+        verdict = "MLE"
+    elif proc.returncode != 0:
+        verdict = "RE"
+    elif output == expected:
+        verdict = "AC"
+    else:
+        verdict = "WA"
+
+    return {
+        "case": number,
+        "verdict": verdict,
+        "expected": expected,
+        "output": output,
+        "time": round(elapsed, 3),
+        # Linux では KB 単位、macOS ではバイト単位
+        "peak_rss_mb": round(usage.ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1),
+        "returncode": proc.returncode,
+    }
+
+
+def print_table(results):
+    header = ("case", "verdict", "time[s]", "rss[MB]", "expected", "output")
+    rows = [
+        (r["case"], r["verdict"], f'{r["time"]:.2f}', r["peak_rss_mb"], r["expected"], r["output"]) for r in results
+    ]
+    widths = [max(len(str(v)) for v in column) for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  ".join(str(v).ljust(wd) for v, wd in zip(row, widths)))
+    passed = sum(r["verdict"] == "AC" for r in results)
+    print(f"-----------------\nJudge : {passed}/{len(results)} AC")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=str(HERE / "testcase"), help="テストケースのディレクトリ")
+    parser.add_argument("--case", type=int, action="append", help="実行するケース番号 (省略時はすべて)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time-limit", type=float, default=16, help="ケースごとの時間制限 [秒]")
+    parser.add_argument("--memory-limit", type=int, default=1024, help="ケースごとのメモリ制限 [MB] (0 で無制限)")
+    parser.add_argument("--json", help="結果を JSON で書き出すパス (- なら標準出力)")
+    parser.add_argument("extra_args", nargs="*", help="main.py に渡す引数 (-- の後に書く)")
+    args = parser.parse_args()
+
+    cases = [case for case in find_cases(args.cases) if args.case is None or case[0] in args.case]
+    if not cases:
+        parser.error(f"{args.cases} にテストケースがありません")
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [
+            pool.submit(run_case, *case, args.time_limit, args.memory_limit, args.extra_args) for case in cases
+        ]
+        results = [f.result() for f in futures]
+
+    if args.json == "-":
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results)
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    sys.exit(0 if all(r["verdict"] == "AC" for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import mmap
+import sys
+from array import array
+
+from flat_grid import FlatGrid, np
+
+# 一度に int へ変換するテキストの大きさ (数値の途中で切らないように、直前の空白までで区切る)
+# 分割した bytes のリストが一時的に大きくならないよう、1MB 程度に抑える
+CHUNK_SIZE = 1 << 20
+
+
+def read_grid(path=None, backend=None) -> FlatGrid:
+    """README の入力形式 (1行目に h w、続く h 行にコスト) を読み込んで FlatGrid を返す
+
+    path が None なら sys.stdin.buffer を一度に読み、ファイルパスなら mmap で読む。
+    input() で1行ずつ読む代わりに、テキストをまとめて int の1次元バッファに変換する。
+    backend: "array" / "numpy" (None なら numpy があれば numpy を使う)
+    """
+    if backend is None:
+        backend = "array" if np is None else "numpy"
+    if path is None:
+        return parse_grid(sys.stdin.buffer.read(), backend)
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            raise ValueError(f"{path} が空です")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return parse_grid(buf, backend)
+
+
+def parse_grid(buf, backend="array") -> FlatGrid:
+    """bytes / mmap に入った入力テキストを FlatGrid に変換する"""
+    h, w, offset = parse_header(buf)
+    n = h * w
+
+    if backend == "numpy":
+        if np is None:
+            raise ImportError("backend='numpy' には numpy が必要です")
+        cells = np.empty(n, dtype=np.int64)
+        k = 0
+        for values in iter_int_chunks(buf, offset, backend):
+            if k + len(values) > n:
+                raise ValueError(f"セルの数が h * w = {n} より多いです")
+            cells[k:k + len(values)] = values
+            k += len(values)
+    elif backend == "array":
+        cells = array("l")
+        for values in iter_int_chunks(buf, offset, backend):
+            cells.fromlist(values)
+        k = len(cells)
+    else:
+        raise ValueError(f"unknown backend: {backend}")
+
+    if k != n:
+        raise ValueError(f"セルの数 {k} が h * w = {n} と一致しません")
+    return FlatGrid(h, w, cells)
+
+
+def parse_header(buf) -> tuple[int, int, int]:
+    """1行目の h w を読み、(h, w, 2行目の先頭位置) を返す"""
+    header_end = buf.find(b"\n")
+    if header_end < 0:
+        header_end = len(buf)
+    h, w = map(int, buf[:header_end].split())
+    return h, w, header_end + 1
+
+
+def iter_int_chunks(buf, start, backend="array"):
+    """buf[start:] の空白区切りの整数を、CHUNK_SIZE 程度ずつまとめて返す
+
+    backend が "numpy" なら numpy.int64 の配列、"array" なら int のリストを返す。
+    """
+    for chunk in _chunks(buf, start):
+        if backend == "numpy":
+            if chunk.isspace():  # 空白だけの文字列を fromstring に渡すと [0] が返るため
+                continue
+            yield np.fromstring(chunk, dtype=np.int64, sep=" ")
+        else:
+            yield list(map(int, chunk.split()))
+
+
+def _chunks(buf, start):
+    """buf[start:] を、数値の途中で切らないように CHUNK_SIZE 程度ずつの bytes に分けて返す"""
+    size = len(buf)
+    while start < size:
+        end = min(start + CHUNK_SIZE, size)
+        if end < size:
+            cut = max(buf.rfind(b"\n", start, end), buf.rfind(b" ", start, end))
+            if cut < 0:  # 区間内に空白が無ければ、次の空白まで伸ばす
+                cut = min((i for i in (buf.find(b"\n", end), buf.find(b" ", end)) if i >= 0), default=size - 1)
+            end = cut + 1
+        yield buf[start:end]
+        start = end
@@ -1,13 +1,48 @@
+import argparse
 import heapq
+import time
+
+from binary_grid import is_binary_grid, load_binary
+from dial import min_cost_auto, min_cost_dial
+from flat_dijkstra import min_cost_flat
+from flat_grid import FlatGrid, as_flat_grid
+from loader import read_grid
+from neighborhood import min_cost_general
+from paths import min_cost_path
+from single_pair import min_cost_astar, min_cost_bidirectional
+from wavefront import min_cost_wavefront
+
+# engine名 -> FlatGrid を受け取るソルバ
+FLAT_ENGINES = {
+    "flat": min_cost_flat,
+    "dial": min_cost_dial,
+    "auto": min_cost_auto,
+    "astar": min_cost_astar,
+    "bidirectional": min_cost_bidirectional,
+    "padded": min_cost_general,
+    "wavefront": min_cost_wavefront,
+}
+
+
+def min_cost(grid, start, end, engine="heap"):
+    """start から end までに通るマス(両端を含む)のコストの合計の最小値を返す
 
+    engine: "heap" はリストのリストを使う従来の実装。
+            FLAT_ENGINES のキーを指定すると、グリッドを1次元バッファに変換して解く。
+    """
+    if engine != "heap":
+        if engine not in FLAT_ENGINES:
+            raise ValueError(f"unknown engine: {engine}")
+        return FLAT_ENGINES[engine](as_flat_grid(grid), start, end)
+    if isinstance(grid, FlatGrid):
+        grid = grid.rows()
 
-def min_cost(grid, start, end):
     h, w = len(grid), len(grid[0])
     directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
     pq = [(grid[start[0]][start[1]], start[0], start[1])]
     costs = [[float('inf')] * w for _ in range(h)]
     costs[start[0]][start[1]] = grid[start[0]][start[1]]
-    
+
     while pq:
         cost, x, y = heapq.heappop(pq)
         if (x, y) == end:
@@ -21,15 +56,34 @@ def min_cost(grid, start, end):
                     heapq.heappush(pq, (new_cost, nx, ny))
 
 
-# 入力例
-h, w = map(int, input().split())
-grid = [list(map(int, input().split())) for _ in range(h)]
-start, end = (0, 0), (h-1, w-1)
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?", help="入力ファイル (テキスト形式かバイナリ形式、省略時は標準入力)")
+    parser.add_argument("--engine", default="heap", choices=["heap", *FLAT_ENGINES])
+    parser.add_argument("--sleep", type=float, default=0, help="解く前に止める秒数 (judge の時間制限の確認用)")
+    parser.add_argument("--path", action="store_true", help="最小コストに続けて経路と最小コスト経路の数も出力する")
+    args = parser.parse_args()
 
-# 17秒ここでテスト用にストップする
-import time
-time.sleep(3)
+    # 入力例
+    if args.input is not None and is_binary_grid(args.input):
+        grid = load_binary(args.input)
+    else:
+        grid = read_grid(args.input)
+    start, end = (0, 0), (grid.h-1, grid.w-1)
+
+    # judge の時間制限を試すときだけ、ここで止める (既定では止めないので実行時間を歪めない)
+    if args.sleep:
+        time.sleep(args.sleep)
+
+    # 最小コストを計算
+    if args.path:
+        cost, path, count = min_cost_path(grid, start, end)
+        print(cost)
+        print(" -> ".join(f"({x},{y})" for x, y in path))
+        print(count)
+    else:
+        print(min_cost(grid, start, end, args.engine))
 
 
-# 最小コストを計算
-print(min_cost(grid, start, end))
+if __name__ == "__main__":
+    main()
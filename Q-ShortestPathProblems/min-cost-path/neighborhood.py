@@ -0,0 +1,131 @@
+import heapq
+from array import array
+
+from flat_dijkstra import INF
+from flat_grid import as_flat_grid
+
+FOUR = ((0, 1), (1, 0), (0, -1), (-1, 0))
+EIGHT = FOUR + ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class Neighborhood:
+    """移動できる方向と、その方向でマスに入るときのコストの倍率
+
+    辺のコストは「入るマスのコスト x 方向の倍率」、始点のマスのコストは「始点のコスト x start_weight」。
+    斜め移動を √2 倍にしたいときは OCTILE のように整数に拡大した倍率 (10 / 14) を使う。
+    """
+
+    def __init__(self, moves, weights=None, start_weight=1):
+        self.moves = tuple(moves)
+        self.weights = tuple(weights) if weights is not None else (1,) * len(self.moves)
+        if len(self.weights) != len(self.moves):
+            raise ValueError("moves と weights の長さが一致しません")
+        if len(self.moves) > 8:
+            raise ValueError("方向は 8 つまでです")
+        self.start_weight = start_weight
+
+
+FOUR_NEIGHBORS = Neighborhood(FOUR)
+EIGHT_NEIGHBORS = Neighborhood(EIGHT)
+OCTILE = Neighborhood(EIGHT, weights=(10,) * 4 + (14,) * 4, start_weight=10)
+
+
+class PaddedGrid:
+    """周囲を番兵の壁で1マスずつ囲んだ1次元グリッド
+
+    マス (x, y) は index = (x + 1) * (w + 2) + (y + 1)。
+    壁と通れないマスは距離の初期値を -1 にしておくので、緩和の比較 (c < dist[j]) が必ず偽になり、
+    探索ループで範囲外や通行不可の分岐をせずに済む。
+
+    blocked: 通れないマスの (x, y) の列
+    oneway: {(x, y): そのマスに入ってよい移動方向 (dx, dy) の集合} (それ以外の方向からは入れない)
+    """
+
+    def __init__(self, grid, blocked=(), oneway=None):
+        grid = as_flat_grid(grid)
+        h, w = grid.h, grid.w
+        self.h, self.w = h, w
+        self.stride = stride = w + 2
+        size = (h + 2) * stride
+        src = grid.view()
+
+        self.cells = array("l", [0]) * size
+        self.template = array("q", [-1]) * size
+        open_row = array("q", [INF]) * w
+        for x in range(h):
+            k = (x + 1) * stride + 1
+            self.cells[k:k + w] = array("l", src[x * w:(x + 1) * w].tolist())
+            self.template[k:k + w] = open_row
+        for x, y in blocked:
+            self.template[self.index(x, y)] = -1
+        self.oneway = dict(oneway or {})
+
+    def index(self, x, y) -> int:
+        return (x + 1) * self.stride + (y + 1)
+
+    def position(self, i) -> tuple[int, int]:
+        x, y = divmod(i, self.stride)
+        return x - 1, y - 1
+
+    def enter_masks(self, neighborhood: Neighborhood) -> bytearray:
+        """oneway をマスごとの「入ってよい方向」のビットマスクにする (bit d = neighborhood.moves[d])"""
+        masks = bytearray(b"\xff") * len(self.cells)
+        for (x, y), moves in self.oneway.items():
+            allowed = set(moves)
+            masks[self.index(x, y)] = sum(1 << d for d, move in enumerate(neighborhood.moves) if move in allowed)
+        return masks
+
+
+def min_cost_general(grid, start, end, neighborhood=FOUR_NEIGHBORS, blocked=(), oneway=None):
+    """近傍・方向ごとの重み・通行不可のマス・一方通行のマスを指定できる min_cost
+
+    grid には PaddedGrid を渡すと、複数回のクエリで壁で囲む処理を使い回せる (その場合 blocked / oneway は無視する)。
+    到達できなければ None を返す。
+    """
+    if not isinstance(grid, PaddedGrid):
+        grid = PaddedGrid(grid, blocked, oneway)
+    s = grid.index(*start)
+    t = grid.index(*end)
+    n = len(grid.cells)
+    cells = grid.cells
+    dist = array("q", grid.template)
+    if dist[s] < 0:
+        return None
+
+    # 方向ごとの index のずれ・重み・ビットを前計算しておく
+    stride = grid.stride
+    moves = [(dx * stride + dy, weight) for (dx, dy), weight in zip(neighborhood.moves, neighborhood.weights)]
+    dist[s] = cells[s] * neighborhood.start_weight
+    pq = [dist[s] * n + s]
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    if grid.oneway:
+        masks = grid.enter_masks(neighborhood)
+        moves = [(offset, weight, 1 << d) for d, (offset, weight) in enumerate(moves)]
+        while pq:
+            cost, i = divmod(heappop(pq), n)
+            if cost > dist[i]:
+                continue
+            if i == t:
+                return cost
+            for offset, weight, bit in moves:
+                j = i + offset
+                c = cost + cells[j] * weight
+                if c < dist[j] and masks[j] & bit:
+                    dist[j] = c
+                    heappush(pq, c * n + j)
+        return None
+
+    while pq:
+        cost, i = divmod(heappop(pq), n)
+        if cost > dist[i]:
+            continue
+        if i == t:
+            return cost
+        for offset, weight in moves:
+            j = i + offset
+            c = cost + cells[j] * weight
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, c * n + j)
+    return None
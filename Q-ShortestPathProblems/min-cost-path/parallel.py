@@ -0,0 +1,56 @@
+from multiprocessing import Pool, shared_memory
+
+from flat_grid import FlatGrid, as_flat_grid
+from main import FLAT_ENGINES
+
+# ワーカープロセスごとに1回だけ共有メモリに接続し、以降のタスクで使い回す
+_worker = {}
+
+
+def share_grid(grid: FlatGrid) -> shared_memory.SharedMemory:
+    """grid のセルを共有メモリにコピーして返す (close / unlink は呼び出し側で行う)"""
+    cells = grid.view()
+    shm = shared_memory.SharedMemory(create=True, size=max(1, cells.nbytes))
+    shm.buf[:cells.nbytes] = cells.cast("B")
+    return shm
+
+
+def attach_grid(name, h, w, fmt, itemsize) -> tuple[shared_memory.SharedMemory, FlatGrid]:
+    """share_grid で作った共有メモリに接続し、コピーせずに FlatGrid として見る"""
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python 3.12 以前は track 引数が無い
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, FlatGrid(h, w, shm.buf[:h * w * itemsize].cast(fmt))
+
+
+def _init_worker(name, h, w, fmt, itemsize, engine):
+    shm, grid = attach_grid(name, h, w, fmt, itemsize)
+    _worker.update(shm=shm, grid=grid, solve=FLAT_ENGINES[engine])
+
+
+def _solve(query):
+    start, end = query
+    return _worker["solve"](_worker["grid"], start, end)
+
+
+def min_cost_many(grid, queries, processes=None, engine="flat", chunksize=4):
+    """(start, end) のクエリ列をプロセスプールで並列に解き、結果を queries の順に1件ずつ返す
+
+    グリッドは共有メモリに1度だけ置き、ワーカーはそれを直接参照するので、タスクごとに pickle されない。
+    ジェネレータなので、全件そろう前から先頭の結果を受け取れる。
+    engine: FLAT_ENGINES のキーだけを受け付ける ("heap" など、それ以外は ValueError)。
+    """
+    # ワーカーの初期化で失敗すると Pool が作り直し続けて返らなくなるので、先に親プロセスで確かめる
+    if engine not in FLAT_ENGINES:
+        raise ValueError(f"unknown engine: {engine}")
+    grid = as_flat_grid(grid)
+    cells = grid.view()
+    shm = share_grid(grid)
+    try:
+        initargs = (shm.name, grid.h, grid.w, cells.format, cells.itemsize, engine)
+        with Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+            yield from pool.imap(_solve, queries, chunksize)
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,107 @@
+import heapq
+from array import array
+
+from flat_dijkstra import INF
+from flat_grid import as_flat_grid
+
+MOD = 10**9 + 7
+
+
+def min_cost_path(grid, start, end, mod=MOD):
+    """最小コストに加えて、最小コスト経路の1つと、最小コスト経路の数 (mod で割った余り) を返す
+
+    ダイクストラ法の緩和と同時に count[v] (start から v までの最小コスト経路の数) を更新する。
+    マスのコストが 1 以上なら、v が確定する前に v へ最小コストで入るマスはすべて確定しているので、count も確定する。
+    経路は直前のマスを記録せず、探索のあとに end から dist[u] + cells[v] == dist[v] となる隣 u をたどって復元する。
+    dist[u] < dist[v] <= dist[end] なので u は確定済みで、復元は経路の長さに比例する時間で済む。
+
+    戻り値: (cost, [(x, y), ...], count)。到達できなければ (None, [], 0)
+    """
+    grid = as_flat_grid(grid)
+    w = grid.w
+    n = len(grid)
+    cells = grid.view()
+    s = start[0] * w + start[1]
+    t = end[0] * w + end[1]
+
+    dist = array("q", [INF]) * n
+    count = array("q", [0]) * n
+    dist[s] = cells[s]
+    count[s] = 1
+    pq = [cells[s] * n + s]
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while pq:
+        cost, i = divmod(heappop(pq), n)
+        if cost > dist[i]:
+            continue
+        if i == t:
+            break
+        # 右・下・左・上の順に緩和する (範囲外は index と列番号で判定)。
+        # 多くの隣は確定済みでコストが大きいので、比較1回で読み飛ばせるよう c <= dist[j] を先に見る
+        k = count[i]
+        y = i % w
+        if y + 1 < w:
+            j = i + 1
+            c = cost + cells[j]
+            d = dist[j]
+            if c <= d:
+                if c < d:
+                    dist[j] = c
+                    count[j] = k
+                    heappush(pq, c * n + j)
+                else:
+                    count[j] = (count[j] + k) % mod
+        j = i + w
+        if j < n:
+            c = cost + cells[j]
+            d = dist[j]
+            if c <= d:
+                if c < d:
+                    dist[j] = c
+                    count[j] = k
+                    heappush(pq, c * n + j)
+                else:
+                    count[j] = (count[j] + k) % mod
+        if y:
+            j = i - 1
+            c = cost + cells[j]
+            d = dist[j]
+            if c <= d:
+                if c < d:
+                    dist[j] = c
+                    count[j] = k
+                    heappush(pq, c * n + j)
+                else:
+                    count[j] = (count[j] + k) % mod
+        j = i - w
+        if j >= 0:
+            c = cost + cells[j]
+            d = dist[j]
+            if c <= d:
+                if c < d:
+                    dist[j] = c
+                    count[j] = k
+                    heappush(pq, c * n + j)
+                else:
+                    count[j] = (count[j] + k) % mod
+    else:
+        return None, [], 0
+
+    path = [divmod(t, w)]
+    i = t
+    while i != s:
+        # 右・下・左・上の隣のうち、i に最小コストで入れるものへ戻る
+        prev = dist[i] - cells[i]
+        y = i % w
+        if y + 1 < w and dist[i + 1] == prev:
+            i += 1
+        elif i + w < n and dist[i + w] == prev:
+            i += w
+        elif y and dist[i - 1] == prev:
+            i -= 1
+        else:
+            i -= w
+        path.append(divmod(i, w))
+    path.reverse()
+    return cost, path, count[t]
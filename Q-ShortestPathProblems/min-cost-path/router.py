@@ -0,0 +1,75 @@
+from array import array
+from collections import OrderedDict, namedtuple
+
+from flat_dijkstra import INF, distance_field
+from flat_grid import as_flat_grid
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class GridRouter:
+    """1つのグリッドに対して多数の (start, end) クエリに答える
+
+    始点ごとに全マスへの距離 (distance_field) を計算して LRU でキャッシュするので、
+    同じ始点のクエリは2回目以降 O(1) で答えられる。
+
+    hits / misses は distances() でのキャッシュの参照だけを数える。
+    query_many が始点ごとにまとめたことで参照せずに済んだクエリの数は grouped に数える。
+    """
+
+    def __init__(self, grid, maxsize: int = 16):
+        if maxsize < 1:
+            raise ValueError("maxsize は 1 以上を指定してください")
+        self.grid = as_flat_grid(grid)
+        self.maxsize = maxsize
+        self._fields: OrderedDict[int, array] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.grouped = 0
+
+    def distances(self, start) -> array:
+        """start から各マスへの距離の array('q') を返す (到達不能は INF)"""
+        s = self.grid.index(*start)
+        field = self._fields.get(s)
+        if field is not None:
+            self.hits += 1
+            self._fields.move_to_end(s)
+            return field
+
+        self.misses += 1
+        field = distance_field(self.grid, start)
+        self._fields[s] = field
+        if len(self._fields) > self.maxsize:
+            self._fields.popitem(last=False)
+        return field
+
+    def query(self, start, end):
+        """min_cost(grid, start, end) と同じ値を返す"""
+        cost = self.distances(start)[self.grid.index(*end)]
+        return None if cost == INF else cost
+
+    def query_many(self, queries) -> list:
+        """(start, end) のリストに答える
+
+        始点ごとにまとめて処理するので、キャッシュに収まらない数の始点があっても各始点の探索は1回で済む。
+        結果は queries と同じ順に並ぶ。
+        """
+        groups: dict[tuple, list[int]] = {}
+        for k, (start, _) in enumerate(queries):
+            groups.setdefault(tuple(start), []).append(k)
+
+        results = [None] * len(queries)
+        for start, ks in groups.items():
+            field = self.distances(start)
+            self.grouped += len(ks) - 1
+            for k in ks:
+                cost = field[self.grid.index(*queries[k][1])]
+                results[k] = None if cost == INF else cost
+        return results
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._fields))
+
+    def cache_clear(self):
+        self._fields.clear()
+        self.hits = self.misses = self.grouped = 0
@@ -0,0 +1,126 @@
+import heapq
+from array import array
+
+from flat_dijkstra import INF
+from flat_grid import FlatGrid
+
+
+def neighbors(i, h, w):
+    """マス i の上下左右のうち、グリッド内にあるマスの index を返す"""
+    x, y = divmod(i, w)
+    if y + 1 < w:
+        yield i + 1
+    if x + 1 < h:
+        yield i + w
+    if y:
+        yield i - 1
+    if x:
+        yield i - w
+
+
+def min_cost_astar(grid: FlatGrid, start, end, stats=None):
+    """min_cost と同じ値を A* 探索で求める
+
+    残りの経路は少なくともマンハッタン距離の数だけマスに入るので、
+    「マンハッタン距離 x 最小のマスのコスト」は許容的かつ無矛盾なヒューリスティックになる。
+    無矛盾なので、ダイクストラ法と同じく一度確定したマスを再展開する必要はない。
+    """
+    h, w = grid.h, grid.w
+    n = h * w
+    cells = grid.view()
+    s = start[0] * w + start[1]
+    t = end[0] * w + end[1]
+    tx, ty = end
+    m = grid.min_cost()
+
+    def heuristic(i):
+        x, y = divmod(i, w)
+        return m * (abs(x - tx) + abs(y - ty))
+
+    dist = array("q", [INF]) * n
+    dist[s] = cells[s]
+    # ヒープには f = g + heuristic を cost の代わりに積む
+    pq = [(cells[s] + heuristic(s)) * n + s]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    expanded = 0
+    result = None
+
+    while pq:
+        f, i = divmod(heappop(pq), n)
+        cost = f - heuristic(i)
+        if cost > dist[i]:
+            continue
+        expanded += 1
+        if i == t:
+            result = cost
+            break
+        for j in neighbors(i, h, w):
+            c = cost + cells[j]
+            if c < dist[j]:
+                dist[j] = c
+                heappush(pq, (c + heuristic(j)) * n + j)
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return result
+
+
+def min_cost_bidirectional(grid: FlatGrid, start, end, stats=None):
+    """min_cost と同じ値を、start と end の両側から進める双方向ダイクストラ法で求める
+
+    マスのコストを「そのマスに入る辺の重み」とみなす。
+    前向き: df[s] = t_s、df[v] = df[u] + t_v
+    後ろ向き: db[e] = 0、db[u] = db[v] + t_v (u -> v の辺を逆にたどる)
+    とすると、マス v を通る経路のコストは df[v] + db[v] になる。
+    両側の辺でつながった時点の最小値 mu を保持し、両ヒープの先頭の和が mu 以上になったら終了する。
+    """
+    h, w = grid.h, grid.w
+    n = h * w
+    cells = grid.view()
+    s = start[0] * w + start[1]
+    t = end[0] * w + end[1]
+
+    df = array("q", [INF]) * n
+    db = array("q", [INF]) * n
+    df[s] = cells[s]
+    db[t] = 0
+    pf = [cells[s] * n + s]
+    pb = [t]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    expanded = 0
+    mu = cells[s] if s == t else INF
+
+    while pf and pb:
+        top_f, top_b = pf[0] // n, pb[0] // n
+        if top_f + top_b >= mu:
+            break
+
+        # 先頭の小さい側を1マス進める
+        if top_f <= top_b:
+            cost, i = divmod(heappop(pf), n)
+            if cost > df[i]:
+                continue
+            expanded += 1
+            for j in neighbors(i, h, w):
+                c = cost + cells[j]
+                if c < df[j]:
+                    df[j] = c
+                    heappush(pf, c * n + j)
+                if db[j] != INF and c + db[j] < mu:
+                    mu = c + db[j]
+        else:
+            cost, i = divmod(heappop(pb), n)
+            if cost > db[i]:
+                continue
+            expanded += 1
+            c = cost + cells[i]
+            for j in neighbors(i, h, w):
+                if c < db[j]:
+                    db[j] = c
+                    heappush(pb, c * n + j)
+                if df[j] != INF and df[j] + c < mu:
+                    mu = df[j] + c
+
+    if stats is not None:
+        stats["expanded"] = expanded
+    return None if mu == INF else mu
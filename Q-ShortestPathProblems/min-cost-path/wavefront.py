@@ -0,0 +1,66 @@
+from flat_grid import FlatGrid, as_flat_grid, np
+
+# numpy 版の距離の初期値 (累積和を足し引きしても int64 からあふれないよう 2^62 にする)
+INF = 1 << 62
+
+
+def distance_field_numpy(grid, start, stats=None):
+    """start から全マスへの最小コストを、numpy の行・列方向の一括緩和を収束するまで繰り返して求める
+
+    行 r を左から右へ緩和すると、P を行方向のコストの累積和として
+        d'[j] = min_{k <= j} (d[k] + c[k+1] + ... + c[j]) = P[j] + min_{k <= j} (d[k] - P[k])
+    となるので、cumsum と minimum.accumulate で全行を一度に処理できる。
+    右→左・上→下・下→上も同様に行い、値が変わらなくなったら終了する。
+    2回目以降は、直前の列 (行) 方向の緩和で値が変わった行 (列) だけを処理する。
+    反復回数は最短経路の「折れ曲がり」の多さに比例するので、迷路のようなグリッドでは多くなる。
+
+    戻り値: 形が (h, w) の int64 配列 (到達できないマスはない)
+    stats に dict を渡すと、反復回数を stats["iterations"] に入れる。
+    """
+    if np is None:
+        raise ImportError("distance_field_numpy には numpy が必要です")
+    grid = as_flat_grid(grid)
+    cost = np.asarray(grid.view(), dtype=np.int64).reshape(grid.h, grid.w)
+    dist = np.full_like(cost, INF)
+    dist[start] = cost[start]
+
+    # 4 方向の累積和は反復の間変わらないので先に求めておく
+    row_forward = np.cumsum(cost, axis=1)
+    row_backward = np.cumsum(cost[:, ::-1], axis=1)
+    col_forward = np.cumsum(cost, axis=0)
+    col_backward = np.cumsum(cost[::-1, :], axis=0)
+
+    # 直前の緩和で値が変わった行・列だけを次に処理する
+    rows = np.array([start[0]])
+    iterations = 0
+    while len(rows):
+        iterations += 1
+        sub = dist[rows]
+        sub = _sweep(sub, row_forward[rows], axis=1)
+        sub = _sweep(sub[:, ::-1], row_backward[rows], axis=1)[:, ::-1]
+        cols = np.flatnonzero((sub != dist[rows]).any(axis=0))
+        dist[rows] = sub
+        if iterations == 1:
+            cols = np.arange(grid.w)
+        if not len(cols):
+            break
+
+        sub = dist[:, cols]
+        sub = _sweep(sub, col_forward[:, cols], axis=0)
+        sub = _sweep(sub[::-1, :], col_backward[:, cols], axis=0)[::-1, :]
+        rows = np.flatnonzero((sub != dist[:, cols]).any(axis=1))
+        dist[:, cols] = sub
+
+    if stats is not None:
+        stats["iterations"] = iterations
+    return dist
+
+
+def _sweep(dist, prefix, axis):
+    """axis 方向に index の小さい側から大きい側へ一括で緩和する"""
+    return np.minimum(dist, np.minimum.accumulate(dist - prefix, axis=axis) + prefix)
+
+
+def min_cost_wavefront(grid: FlatGrid, start, end):
+    """distance_field_numpy で全マスの距離を求め、end の値を返す"""
+    return int(distance_field_numpy(grid, start)[end])
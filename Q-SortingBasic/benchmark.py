@@ -0,0 +1,457 @@
+"""ソートアルゴリズムのベンチマーク
+
+使い方:
+    python benchmark.py compare --sizes 10 100 1000 10000 100000 1000000
+    python benchmark.py compare --algorithms quick merge builtin --distributions random sorted
+    python benchmark.py merge --sizes 100000 1000000
+    python benchmark.py quick --sizes 1000 100000 1000000
+    python benchmark.py heap --sizes 10000 100000 --grid 300
+    python benchmark.py integer --sizes 10000 1000000 --max-values 1000 1000000 4294967296
+    python benchmark.py external --sizes 1000000 --memory-mb 4 16 64
+
+比較回数と書き込み回数は、要素を比較のたびに数えるラッパーで包み、
+添字への代入を数えるリストに入れて別に実行して数える (--count-max 以下のサイズだけ)。
+"""
+
+import argparse
+import heapq
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from external_sort import external_sort
+from heap import PriorityQueue
+from integer_sort import counting_sort_numpy, np, radix_sort_numpy
+from sorting import ALGORITHMS
+
+# 要素を比較しないソート (比較回数・書き込み回数は数えない)
+NON_COMPARISON = {"counting", "radix", "integer"}
+
+# O(n^2) のアルゴリズムは、これより大きいサイズでは --no-limit を付けない限り計測しない
+SIZE_LIMITS = {"bubble": 3000, "insertion": 3000, "selection": 3000, "merge": 100000, "heap": 100000}
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few-unique", "organ-pipe")
+
+
+def make_input(kind, n, seed=0) -> list[int]:
+    """ベンチマーク用の入力を作る
+
+    random: 0 以上 n 未満の一様乱数
+    sorted / reversed: 昇順 / 降順
+    few-unique: 0 以上 10 未満の一様乱数 (重複が多い)
+    organ-pipe: 前半が昇順、後半が降順 (0, 1, ..., n/2, ..., 1, 0)
+    """
+    rnd = random.Random(seed)
+    if kind == "random":
+        return [rnd.randrange(n) for _ in range(n)]
+    if kind == "sorted":
+        return list(range(n))
+    if kind == "reversed":
+        return list(range(n, 0, -1))
+    if kind == "few-unique":
+        return [rnd.randrange(10) for _ in range(n)]
+    if kind == "organ-pipe":
+        half = (n + 1) // 2
+        return list(range(half)) + list(range(n - half - 1, -1, -1))
+    raise ValueError(f"不明な分布です: {kind}")
+
+
+class CountedKey:
+    """比較演算のたびに CountedKey.comparisons を 1 増やす値のラッパー"""
+
+    __slots__ = ("value",)
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        CountedKey.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other):
+        CountedKey.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        CountedKey.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other):
+        CountedKey.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other):
+        CountedKey.comparisons += 1
+        return self.value == other.value
+
+    __hash__ = None
+
+
+class CountingList(list):
+    """添字への代入 (入れ替えは 2 回と数える) の回数を writes に数えるリスト
+
+    新しいリストを作って返すアルゴリズム (クイック・マージ・sorted) の書き込みは数えられないので、
+    それらはピークメモリ (allocations) の方で比べる。
+    """
+
+    def __init__(self, values):
+        super().__init__(values)
+        self.writes = 0
+
+    def __setitem__(self, index, value):
+        self.writes += 1
+        super().__setitem__(index, value)
+
+
+def count_operations(func, data) -> tuple[int, int]:
+    """func で data をソートしたときの (比較回数, 書き込み回数) を返す"""
+    array = CountingList(map(CountedKey, data))
+    CountedKey.comparisons = 0
+    result = func(array)
+    if [key.value for key in result] != sorted(data):
+        raise AssertionError(f"{func.__name__} の結果がソートされていません")
+    return CountedKey.comparisons, array.writes
+
+
+def measure(func, *args, memory=True):
+    """func(*args) の (結果, 実行時間[秒], ピークメモリ[MB]) を返す
+
+    時間は tracemalloc なしで計測し、memory=True ならもう一度 tracemalloc 下で実行してピークを測る。
+    """
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def format_row(cells, widths):
+    return "  ".join(str(c).rjust(wd) for c, wd in zip(cells, widths))
+
+
+def sort_copy(func, data):
+    """入力を書き換えるアルゴリズムでも同じ入力で繰り返し測れるよう、コピーしてからソートする"""
+    return func(list(data))
+
+
+def bench_compare(args):
+    """アルゴリズム x 分布 x サイズごとに、時間・ピークメモリ・比較回数・書き込み回数と sorted() 比を表示する
+
+    RecursionError になった (アルゴリズム, 分布) の組は、それより大きいサイズでは計測しない。
+    """
+    failed = set()
+    widths = (8, 11, 10, 10, 8, 10, 12, 12)
+    header = ("size", "dist", "algo", "time[s]", "ratio", "peak[MB]", "comparisons", "writes")
+    print(format_row(header, widths))
+    for size in sorted(args.sizes):
+        for kind in args.distributions:
+            data = make_input(kind, size, args.seed)
+            expected = sorted(data)
+            _, baseline, _ = measure(sort_copy, ALGORITHMS["builtin"], data, memory=False)
+            for name in args.algorithms:
+                if (name, kind) in failed or not args.no_limit and size > SIZE_LIMITS.get(name, size):
+                    continue
+                func = ALGORITHMS[name]
+                try:
+                    result, elapsed, peak = measure(sort_copy, func, data, memory=not args.no_memory)
+                except RecursionError:
+                    failed.add((name, kind))
+                    print(format_row((size, kind, name, "RecursionError"), widths))
+                    continue
+                assert result == expected, f"{name} の結果がソートされていません"
+                comparisons = writes = "-"
+                if size <= args.count_max and name not in NON_COMPARISON:
+                    comparisons, writes = count_operations(func, data)
+                ratio = f"{elapsed / baseline:.1f}" if baseline else "-"
+                peak = "-" if peak is None else f"{peak:.2f}"
+                print(format_row((size, kind, name, f"{elapsed:.4f}", ratio, peak, comparisons, writes), widths))
+
+
+def bench_merge(args):
+    """ボトムアップのマージソートをノートブックの merge_sort・sorted() と比べる
+
+    ノートブックの merge_sort は --notebook-max 以下のサイズだけ計測する。
+    """
+    impls = [("bottom-up-merge", 0), ("merge", args.notebook_max), ("builtin", 0)]
+    widths = (8, 11, 16, 10, 10)
+    print(format_row(("size", "dist", "algo", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        for kind in args.distributions:
+            data = make_input(kind, size, args.seed)
+            expected = sorted(data)
+            for name, limit in impls:
+                if limit and size > limit:
+                    print(format_row((size, kind, name, "-", "-"), widths))
+                    continue
+                result, elapsed, peak = measure(sort_copy, ALGORITHMS[name], data, memory=not args.no_memory)
+                assert result == expected, f"{name} の結果がソートされていません"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, kind, name, f"{elapsed:.3f}", peak), widths))
+
+
+def bench_quick(args):
+    """イントロソートをノートブックの quick_sort・sorted() と比べる
+
+    quick_sort が RecursionError になった分布は、それより大きいサイズでは計測しない。
+    """
+    failed = set()
+    widths = (8, 11, 10, 10, 10)
+    print(format_row(("size", "dist", "algo", "time[s]", "peak[MB]"), widths))
+    for size in sorted(args.sizes):
+        for kind in args.distributions:
+            data = make_input(kind, size, args.seed)
+            expected = sorted(data)
+            for name in ("introsort", "quick", "builtin"):
+                if (name, kind) in failed:
+                    continue
+                try:
+                    result, elapsed, peak = measure(sort_copy, ALGORITHMS[name], data, memory=not args.no_memory)
+                except RecursionError:
+                    failed.add((name, kind))
+                    print(format_row((size, kind, name, "RecursionError"), widths))
+                    continue
+                assert result == expected, f"{name} の結果がソートされていません"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, kind, name, f"{elapsed:.3f}", peak), widths))
+
+
+def random_costs(size, seed=0, max_cost=9) -> list[int]:
+    """一辺 size のグリッドの各マスのコスト (1 以上 max_cost 以下、index = x * size + y)"""
+    rnd = random.Random(seed)
+    return [rnd.randint(1, max_cost) for _ in range(size * size)]
+
+
+def _grid_neighbors(i, size):
+    x, y = divmod(i, size)
+    if x > 0:
+        yield i - size
+    if x < size - 1:
+        yield i + size
+    if y > 0:
+        yield i - 1
+    if y < size - 1:
+        yield i + 1
+
+
+def dijkstra_heapq(costs, size):
+    """heapq に (距離, マス) を積み、古いエントリを読み飛ばすダイクストラ法。(左上から右下への距離, キューの最大長)"""
+    dist = {0: costs[0]}
+    pq = [(costs[0], 0)]
+    longest = 1
+    goal = size * size - 1
+    while pq:
+        d, i = heapq.heappop(pq)
+        if d > dist[i]:
+            continue
+        if i == goal:
+            return d, longest
+        for j in _grid_neighbors(i, size):
+            c = d + costs[j]
+            if c < dist.get(j, c + 1):
+                dist[j] = c
+                heapq.heappush(pq, (c, j))
+        longest = max(longest, len(pq))
+    return None, longest
+
+
+def dijkstra_priority_queue(costs, size):
+    """PriorityQueue.update で優先度を下げるダイクストラ法。(左上から右下への距離, キューの最大長)"""
+    done = set()
+    pq = PriorityQueue()
+    pq.push(0, costs[0])
+    longest = 1
+    goal = size * size - 1
+    while pq:
+        i, d = pq.pop()
+        if i == goal:
+            return d, longest
+        done.add(i)
+        for j in _grid_neighbors(i, size):
+            if j not in done:
+                pq.update(j, d + costs[j])
+        longest = max(longest, len(pq))
+    return None, longest
+
+
+def bench_heap(args):
+    """ヒープソートと PriorityQueue の比較
+
+    その場で並べ替えるヒープソートをノートブックの heap_sort・sorted() と比べ、
+    グリッドのダイクストラ法で PriorityQueue (decrease-key) と heapq のタプルを比べる。
+    マスのコストで辺の重みが決まるグリッドでは、各マスは heapq でもほぼ1回しか積まれないので、
+    キューの長さはほとんど変わらず、C 実装の heapq の方が速い。
+    """
+    widths = (8, 11, 14, 10, 10)
+    print(format_row(("size", "dist", "algo", "time[s]", "peak[MB]"), widths))
+    for size in args.sizes:
+        for kind in args.distributions:
+            data = make_input(kind, size, args.seed)
+            expected = sorted(data)
+            for name in ("heap-in-place", "heap", "builtin"):
+                if name == "heap" and size > args.notebook_max:
+                    print(format_row((size, kind, name, "-", "-"), widths))
+                    continue
+                result, elapsed, peak = measure(sort_copy, ALGORITHMS[name], data, memory=not args.no_memory)
+                assert result == expected, f"{name} の結果がソートされていません"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, kind, name, f"{elapsed:.3f}", peak), widths))
+
+    print()
+    costs = random_costs(args.grid, args.seed)
+    widths = (8, 16, 10, 10, 12, 10)
+    print(format_row(("grid", "queue", "cost", "time[s]", "max queue", "peak[MB]"), widths))
+    expected = None
+    for name, func in (("heapq", dijkstra_heapq), ("PriorityQueue", dijkstra_priority_queue)):
+        (cost, longest), elapsed, peak = measure(func, costs, args.grid, memory=not args.no_memory)
+        if expected is None:
+            expected = cost
+        assert cost == expected, f"{name} の最短距離が異なります"
+        peak = "-" if peak is None else f"{peak:.1f}"
+        print(format_row((args.grid, name, cost, f"{elapsed:.3f}", longest, peak), widths))
+
+
+def bench_integer(args):
+    """計数ソート・基数ソート (list / numpy) と integer_sort を、sorted()・np.sort・比較ソートと比べる
+
+    値は 0 以上 max-value 未満の一様乱数。計数ソートは値の範囲が --counting-max 以下のときだけ計測する。
+    """
+    impls = ["counting", "radix", "integer", "introsort", "builtin"]
+    numpy_impls = []
+    if np is not None:
+        numpy_impls = [("np-counting", counting_sort_numpy), ("np-radix", radix_sort_numpy), ("np-sort", np.sort)]
+    widths = (8, 12, 12, 10, 10)
+    print(format_row(("size", "max value", "algo", "time[s]", "ratio"), widths))
+    for size in args.sizes:
+        for max_value in args.max_values:
+            rnd = random.Random(args.seed)
+            data = [rnd.randrange(max_value) for _ in range(size)]
+            expected = sorted(data)
+            _, baseline, _ = measure(sort_copy, ALGORITHMS["builtin"], data, memory=False)
+            for name in impls:
+                if name == "counting" and max_value > args.counting_max:
+                    continue
+                result, elapsed, _ = measure(sort_copy, ALGORITHMS[name], data, memory=False)
+                assert result == expected, f"{name} の結果がソートされていません"
+                ratio = f"{elapsed / baseline:.2f}" if baseline else "-"
+                print(format_row((size, max_value, name, f"{elapsed:.4f}", ratio), widths))
+            if not numpy_impls:
+                continue
+            values = np.array(data, dtype=np.int64)
+            for name, func in numpy_impls:
+                if name == "np-counting" and max_value > args.counting_max:
+                    continue
+                result, elapsed, _ = measure(func, values, memory=False)
+                assert result.tolist() == expected, f"{name} の結果がソートされていません"
+                ratio = f"{elapsed / baseline:.2f}" if baseline else "-"
+                print(format_row((size, max_value, name, f"{elapsed:.4f}", ratio), widths))
+
+
+def write_int_file(path, size, seed=0, max_value=2**32):
+    """0 以上 max_value 未満の一様乱数を size 個、1 行に 1 つずつ path に書く"""
+    rnd = random.Random(seed)
+    with open(path, "w") as f:
+        for start in range(0, size, 1 << 16):
+            f.write("".join(f"{rnd.randrange(max_value)}\n" for _ in range(min(1 << 16, size - start))))
+
+
+def in_memory_sort(src, dst):
+    """ファイル全体を読み込んで sorted() で並べ、1 行に 1 つずつ書く (外部ソートとの比較用)"""
+    with open(src, "rb") as f:
+        data = sorted(map(int, f.read().split()))
+    with open(dst, "wb") as f:
+        f.write(("\n".join(map(str, data)) + "\n").encode())
+    return len(data)
+
+
+def external_sort_file(src, dst, memory_limit, tmpdir):
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return external_sort(fin, fout, memory_limit, tmpdir)
+
+
+def bench_external(args):
+    """ファイルの整数を外部マージソートで並べ、メモリの上限ごとに時間とピークメモリを全体を読み込む場合と比べる
+
+    入力・出力・ランの一時ファイルはすべて一時ディレクトリに置き、終わったら消す。
+    """
+    widths = (9, 12, 10, 10, 10)
+    print(format_row(("size", "algo", "time[s]", "ratio", "peak[MB]"), widths))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = os.path.join(tmpdir, "input.txt")
+        expected_path = os.path.join(tmpdir, "expected.txt")
+        dst = os.path.join(tmpdir, "output.txt")
+        for size in args.sizes:
+            write_int_file(src, size, args.seed)
+            _, baseline, peak = measure(in_memory_sort, src, expected_path, memory=not args.no_memory)
+            peak = "-" if peak is None else f"{peak:.1f}"
+            print(format_row((size, "in-memory", f"{baseline:.3f}", "1.00", peak), widths))
+            with open(expected_path, "rb") as f:
+                expected = f.read()
+            for memory_mb in args.memory_mb:
+                name = f"ext-{memory_mb:g}MB"
+                count, elapsed, peak = measure(
+                    external_sort_file, src, dst, int(memory_mb * 2**20), tmpdir, memory=not args.no_memory
+                )
+                with open(dst, "rb") as f:
+                    assert count == size and f.read() == expected, f"{name} の結果がソートされていません"
+                ratio = f"{elapsed / baseline:.2f}" if baseline else "-"
+                peak = "-" if peak is None else f"{peak:.1f}"
+                print(format_row((size, name, f"{elapsed:.3f}", ratio, peak), widths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc によるメモリ計測を省略する")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("compare", help="アルゴリズム・分布・サイズごとの比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000, 1000000])
+    p.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    p.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    p.add_argument("--count-max", type=int, default=100000, help="比較回数・書き込み回数を数える最大サイズ")
+    p.add_argument("--no-limit", action="store_true", help="O(n^2) のアルゴリズムも全サイズで計測する")
+    p.set_defaults(func=bench_compare)
+
+    p = sub.add_parser("merge", help="ボトムアップのマージソートとノートブックの merge_sort の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    p.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=["random", "sorted", "few-unique"])
+    p.add_argument("--notebook-max", type=int, default=100000, help="ノートブックの merge_sort を計測する最大サイズ")
+    p.set_defaults(func=bench_merge)
+
+    p = sub.add_parser("quick", help="イントロソートとノートブックの quick_sort の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    p.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    p.set_defaults(func=bench_quick)
+
+    p = sub.add_parser("heap", help="その場のヒープソートと PriorityQueue の比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    p.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=["random", "sorted"])
+    p.add_argument("--notebook-max", type=int, default=100000, help="ノートブックの heap_sort を計測する最大サイズ")
+    p.add_argument("--grid", type=int, default=300, help="ダイクストラ法のグリッドの一辺")
+    p.set_defaults(func=bench_heap)
+
+    p = sub.add_parser("integer", help="計数ソート・基数ソートと比較ソートの比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    p.add_argument("--max-values", type=int, nargs="+", default=[1000, 1000000, 2**32], help="値の上限 (含まない)")
+    p.add_argument("--counting-max", type=int, default=10**7, help="計数ソートを計測する値の範囲の上限")
+    p.set_defaults(func=bench_integer)
+
+    p = sub.add_parser("external", help="外部マージソートとファイル全体を読み込むソートの比較")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000000])
+    p.add_argument("--memory-mb", type=float, nargs="+", default=[4, 16, 64], help="外部ソートのメモリの目安 [MB]")
+    p.set_defaults(func=bench_external)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
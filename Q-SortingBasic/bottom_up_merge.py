@@ -0,0 +1,127 @@
+"""補助バッファを1つだけ使うボトムアップのマージソート
+
+ノートブックの merge_sort は再帰のたびに array[:mid] / array[mid:] の新しいリストを作り、
+merge では left.pop(0) で先頭を取り出すので、1 回のマージが O(n^2) になる。
+ここでは
+  1. 長さ MIN_RUN ごとの区間を二分挿入ソートで整列し、
+  2. 幅を 2 倍にしながら隣り合う区間を添字だけでマージする。
+マージでは短い方の区間だけを、最初に1度だけ確保した長さ n // 2 のバッファにコピーする。
+マージの前に bisect で「すでに正しい位置にある両端」を除き、左右がすでに順に並んでいればマージしない。
+マージの途中で一方が MIN_GALLOP 回続けて勝ったら、勝ち続ける範囲を bisect で求めてまとめてコピーする (ギャロップ)。
+安定ソートで、入力のリストをその場で並べ替えて返す。
+"""
+
+from bisect import bisect_left, bisect_right
+
+# 挿入ソートで整列する区間の長さ
+MIN_RUN = 32
+# ギャロップに切り替えるまでに一方が続けて勝つ回数
+MIN_GALLOP = 7
+
+
+def bottom_up_merge_sort(array):
+    n = len(array)
+    for lo in range(0, n, MIN_RUN):
+        insertion_sort_range(array, lo, min(lo + MIN_RUN, n))
+
+    buf = [None] * (n // 2)
+    width = MIN_RUN
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            merge_runs(array, lo, lo + width, min(lo + 2 * width, n), buf)
+        width *= 2
+    return array
+
+
+def insertion_sort_range(array, lo, hi):
+    """array[lo:hi] を二分挿入ソートで整列する (ずらすのはスライス代入でまとめて行う)"""
+    for i in range(lo + 1, hi):
+        key = array[i]
+        if not key < array[i - 1]:
+            continue
+        pos = bisect_right(array, key, lo, i)
+        array[pos + 1:i + 1] = array[pos:i]
+        array[pos] = key
+
+
+def merge_runs(array, lo, mid, hi, buf):
+    """整列済みの array[lo:mid] と array[mid:hi] をマージする (buf は長さ (hi - lo) // 2 以上)"""
+    if not array[mid] < array[mid - 1]:
+        return
+    # 左の区間のうち右の先頭以下の要素と、右の区間のうち左の末尾以上の要素は動かない
+    lo = bisect_right(array, array[mid], lo, mid)
+    hi = bisect_left(array, array[mid - 1], mid, hi)
+    if mid - lo <= hi - mid:
+        _merge_lo(array, lo, mid, hi, buf)
+    else:
+        _merge_hi(array, lo, mid, hi, buf)
+
+
+def _merge_lo(array, lo, mid, hi, buf):
+    """左の区間を buf に移し、先頭から詰めていく"""
+    n_left = mid - lo
+    buf[:n_left] = array[lo:mid]
+    i, j, k = 0, mid, lo
+    left_wins = right_wins = 0
+    while i < n_left and j < hi:
+        if array[j] < buf[i]:
+            array[k] = array[j]
+            j += 1
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP:
+                end = bisect_left(array, buf[i], j, hi)
+                array[k:k + end - j] = array[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            array[k] = buf[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP:
+                end = bisect_right(buf, array[j], i, n_left)
+                array[k:k + end - i] = buf[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+    # 右の残りはすでに正しい位置にある
+    array[k:k + n_left - i] = buf[i:n_left]
+
+
+def _merge_hi(array, lo, mid, hi, buf):
+    """右の区間を buf に移し、末尾から詰めていく"""
+    n_right = hi - mid
+    buf[:n_right] = array[mid:hi]
+    i, j, k = mid - 1, n_right - 1, hi - 1
+    left_wins = right_wins = 0
+    while i >= lo and j >= 0:
+        if buf[j] < array[i]:
+            array[k] = array[i]
+            i -= 1
+            k -= 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP:
+                start = bisect_right(array, buf[j], lo, i + 1)
+                array[k - (i - start):k + 1] = array[start:i + 1]
+                k -= i + 1 - start
+                i = start - 1
+                left_wins = 0
+        else:
+            array[k] = buf[j]
+            j -= 1
+            k -= 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP:
+                start = bisect_left(buf, array[i], 0, j + 1)
+                array[k - (j - start):k + 1] = buf[start:j + 1]
+                k -= j + 1 - start
+                j = start - 1
+                right_wins = 0
+    # 左の残りはすでに正しい位置にある
+    array[lo:lo + j + 1] = buf[:j + 1]
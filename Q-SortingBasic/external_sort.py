@@ -0,0 +1,175 @@
+"""メモリに収まらない整数列を並べる外部マージソート
+
+使い方:
+    python external_sort.py input.txt sorted.txt --memory-mb 64
+    python external_sort.py < input.txt > sorted.txt
+
+入力は整数を 1 行に 1 つ、または空白区切りで書いたテキスト (改行と空白が混ざっていてもよい)。
+  1. 入力を一定のバイト数ずつ読み、memory_limit から決まる件数ずつ integer_sort で並べ、
+     int64 のバイナリ (array('q')) として一時ファイルに書き出す (ラン)。
+  2. ランを heapq.merge で k-way マージし、1 行に 1 つずつ出力する。ランが MAX_FAN_IN を超えたら、
+     先にいくつかずつマージしてランの数を減らす。
+メモリの上限は Python の int 1 つを ITEM_BYTES バイトとみなした目安で、厳密な上限ではない。
+値は int64 の範囲に収まる必要がある (範囲外なら OverflowError)。
+"""
+
+import argparse
+import heapq
+import sys
+import tempfile
+from array import array
+
+from integer_sort import integer_sort
+
+# リストの中の Python の int 1 つあたりのメモリの目安 (ポインタ 8 バイト + int オブジェクト 32 バイト)
+ITEM_BYTES = 40
+# 一度にマージするランの数の上限 (開くファイルの数の上限でもある)
+MAX_FAN_IN = 64
+# 出力をまとめて書き出す件数の上限 (memory_limit が小さいときはもっと少なくする)
+WRITE_BATCH = 1 << 16
+
+
+def iter_int_chunks(file, chunk_bytes):
+    """file (バイナリモード) から chunk_bytes バイトずつ読み、含まれる整数のリストを順に返す
+
+    チャンクの末尾で切れた数字は次のチャンクの先頭につなげる。
+    """
+    rest = b""
+    while True:
+        buf = file.read(chunk_bytes)
+        if not buf:
+            break
+        buf = rest + buf
+        # 最後の空白より後ろは数字の途中かもしれないので次に回す
+        cut = max(buf.rfind(b" "), buf.rfind(b"\n"), buf.rfind(b"\t"), buf.rfind(b"\r")) + 1
+        rest = buf[cut:]
+        values = list(map(int, buf[:cut].split()))
+        if values:
+            yield values
+    if rest.strip():
+        yield list(map(int, rest.split()))
+
+
+def _spill(values, tmpdir):
+    """values を int64 のバイナリとして一時ファイルに書き、先頭に戻したファイルを返す"""
+    f = tempfile.TemporaryFile(dir=tmpdir)
+    array("q", values).tofile(f)
+    f.seek(0)
+    return f
+
+
+def _iter_run(f, block):
+    """ランのファイルから block 件ずつ読んで1件ずつ返す"""
+    itemsize = array("q").itemsize
+    while True:
+        buf = array("q", f.read(block * itemsize))
+        if not buf:
+            return
+        yield from buf
+
+
+def make_runs(file, memory_limit, tmpdir=None) -> list:
+    """file を並べたランの一時ファイルに分けて、そのリストを返す"""
+    # 読み込み中のラン・integer_sort の作業用・読んだチャンクの3つがメモリに乗る
+    # (整数は 1 つあたり 2 バイト以上なので、chunk_bytes バイトのチャンクは run_items 件以下になる)
+    run_items = max(1, memory_limit // (3 * ITEM_BYTES))
+    chunk_bytes = max(1 << 12, 2 * run_items)
+    runs = []
+    current = []
+    for values in iter_int_chunks(file, chunk_bytes):
+        start = 0
+        while start < len(values):
+            take = min(len(values) - start, run_items - len(current))
+            current.extend(values[start:start + take])
+            start += take
+            if len(current) == run_items:
+                runs.append(_spill(integer_sort(current), tmpdir))
+                current = []
+    if current:
+        runs.append(_spill(integer_sort(current), tmpdir))
+    return runs
+
+
+def merge_runs(runs, memory_limit, tmpdir=None):
+    """ランを MAX_FAN_IN 個ずつマージして1つのイテレータにする
+
+    ランが MAX_FAN_IN より多いときは、先にいくつかずつ一時ファイルにマージする。
+    runs はマージ後のランのファイルに置き換えるので、呼び出し側は最後に runs の各ファイルを閉じればよい。
+    """
+    while len(runs) > MAX_FAN_IN:
+        merged = []
+        for k in range(0, len(runs), MAX_FAN_IN):
+            group = runs[k:k + MAX_FAN_IN]
+            block = _block_size(memory_limit, len(group))
+            out = tempfile.TemporaryFile(dir=tmpdir)
+            buf = array("q")
+            for value in heapq.merge(*(_iter_run(f, block) for f in group)):
+                buf.append(value)
+                if len(buf) >= block:
+                    buf.tofile(out)
+                    buf = array("q")
+            buf.tofile(out)
+            for f in group:
+                f.close()
+            out.seek(0)
+            merged.append(out)
+        runs[:] = merged
+    block = _block_size(memory_limit, len(runs))
+    return heapq.merge(*(_iter_run(f, block) for f in runs))
+
+
+def _block_size(memory_limit, fan_in):
+    # 各ランの読み込みバッファ (int64) と、取り出した値の Python の int がメモリに乗る
+    return max(1 << 10, memory_limit // ((fan_in + 1) * ITEM_BYTES))
+
+
+def external_sort(input, output, memory_limit=64 << 20, tmpdir=None) -> int:
+    """input (バイナリモード) の整数を昇順に並べ、1 行に 1 つずつ output (バイナリモード) に書く
+
+    memory_limit: 使うメモリの目安 [バイト]
+    tmpdir: ランの一時ファイルを置くディレクトリ (None なら tempfile の既定)
+    戻り値: 並べた整数の数
+    """
+    runs = make_runs(input, memory_limit, tmpdir)
+    # 書き出す前の int と str、つないだ str が乗るので、1 件あたり ITEM_BYTES の 4 倍とみなす
+    batch_size = min(WRITE_BATCH, max(1 << 10, memory_limit // (4 * ITEM_BYTES)))
+    count = 0
+    try:
+        batch = []
+        for value in merge_runs(runs, memory_limit, tmpdir):
+            batch.append(value)
+            if len(batch) >= batch_size:
+                output.write(("\n".join(map(str, batch)) + "\n").encode())
+                count += len(batch)
+                batch = []
+        if batch:
+            output.write(("\n".join(map(str, batch)) + "\n").encode())
+            count += len(batch)
+    finally:
+        for f in runs:
+            f.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", help="入力ファイル (省略すると標準入力)")
+    parser.add_argument("output", nargs="?", help="出力ファイル (省略すると標準出力)")
+    parser.add_argument("--memory-mb", type=float, default=64, help="使うメモリの目安 [MB]")
+    parser.add_argument("--tmpdir", help="ランの一時ファイルを置くディレクトリ")
+    args = parser.parse_args()
+
+    memory_limit = int(args.memory_mb * 2**20)
+    src = open(args.input, "rb") if args.input else sys.stdin.buffer
+    dst = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        external_sort(src, dst, memory_limit, args.tmpdir)
+    finally:
+        if args.input:
+            src.close()
+        if args.output:
+            dst.close()
+
+
+if __name__ == "__main__":
+    main()
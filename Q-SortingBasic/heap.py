@@ -0,0 +1,146 @@
+"""配列の上の二分ヒープ: その場で並べ替えるヒープソートと、decrease-key のできる優先度付きキュー
+
+ノートブックの heap_sort は array.pop(0) と result.insert(0, ...) で 1 要素ごとに O(n) かかり、
+呼び出し側のリストを空にし、heapify も再帰している。
+ここでは最大ヒープを配列の先頭に作り、根と末尾を入れ替えて sift-down するのを繰り返すので、
+追加のメモリなしに O(n log n) で並べ替える。sift-down はループで書き、入れ替えではなく「穴」を下ろしていく。
+"""
+
+
+def heap_sort(array, lo=0, hi=None):
+    """array[lo:hi] をその場でヒープソートして array を返す (安定ではない)"""
+    if hi is None:
+        hi = len(array)
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(array, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        array[lo], array[lo + end] = array[lo + end], array[lo]
+        sift_down(array, lo, 0, end)
+    return array
+
+
+def sift_down(array, base, i, n):
+    """array[base:base + n] を最大ヒープとみなし、i 番目の要素を子より小さくなくなるまで下ろす"""
+    x = array[base + i]
+    child = 2 * i + 1
+    while child < n:
+        if child + 1 < n and array[base + child] < array[base + child + 1]:
+            child += 1
+        if not x < array[base + child]:
+            break
+        array[base + i] = array[base + child]
+        i = child
+        child = 2 * i + 1
+    array[base + i] = x
+
+
+class PriorityQueue:
+    """優先度の小さい順に取り出す二分ヒープで、要素ごとに優先度を下げられる (decrease-key)
+
+    heapq に (優先度, 要素) のタプルを積む方法では、優先度を下げるたびに新しいタプルを積み、
+    取り出したときに古いものを読み飛ばす必要がある。ここでは要素ごとにヒープ内の位置を持つので、
+    同じ要素は常に1つだけで、ヒープの大きさは要素の種類数を超えない。
+
+    要素はハッシュできる値なら何でもよい (グリッドの探索なら index = x * w + y の int など)。
+    """
+
+    def __init__(self):
+        self._priorities = []
+        self._items = []
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def priority(self, item):
+        """item の今の優先度を返す (キューに無ければ KeyError)"""
+        return self._priorities[self._positions[item]]
+
+    def push(self, item, priority):
+        """item を優先度 priority で追加する (すでにあれば KeyError)"""
+        if item in self._positions:
+            raise KeyError(f"{item!r} はすでにキューにあります")
+        self._priorities.append(priority)
+        self._items.append(item)
+        self._positions[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def decrease_key(self, item, priority):
+        """item の優先度を priority に下げる (今より大きい優先度は ValueError)"""
+        i = self._positions[item]
+        if self._priorities[i] < priority:
+            raise ValueError(f"優先度は下げることしかできません: {self._priorities[i]!r} -> {priority!r}")
+        self._priorities[i] = priority
+        self._sift_up(i)
+
+    def update(self, item, priority) -> bool:
+        """item が無ければ追加し、あれば優先度が下がる場合だけ下げる。キューが変わったら True を返す
+
+        ダイクストラ法の緩和 (「今より短ければ更新」) はこれ1回で書ける。
+        """
+        i = self._positions.get(item)
+        if i is None:
+            self.push(item, priority)
+            return True
+        if priority < self._priorities[i]:
+            self._priorities[i] = priority
+            self._sift_up(i)
+            return True
+        return False
+
+    def peek(self):
+        """優先度が最小の (要素, 優先度) を取り出さずに返す"""
+        if not self._items:
+            raise IndexError("空のキューです")
+        return self._items[0], self._priorities[0]
+
+    def pop(self):
+        """優先度が最小の (要素, 優先度) を取り出して返す"""
+        items, priorities = self._items, self._priorities
+        if not items:
+            raise IndexError("空のキューです")
+        item, priority = items[0], priorities[0]
+        del self._positions[item]
+        last_item, last_priority = items.pop(), priorities.pop()
+        if items:
+            items[0], priorities[0] = last_item, last_priority
+            self._positions[last_item] = 0
+            self._sift_down(0)
+        return item, priority
+
+    def _sift_up(self, i):
+        items, priorities, positions = self._items, self._priorities, self._positions
+        item, priority = items[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not priority < priorities[parent]:
+                break
+            items[i], priorities[i] = items[parent], priorities[parent]
+            positions[items[i]] = i
+            i = parent
+        items[i], priorities[i] = item, priority
+        positions[item] = i
+
+    def _sift_down(self, i):
+        items, priorities, positions = self._items, self._priorities, self._positions
+        n = len(items)
+        item, priority = items[i], priorities[i]
+        child = 2 * i + 1
+        while child < n:
+            if child + 1 < n and priorities[child + 1] < priorities[child]:
+                child += 1
+            if not priorities[child] < priority:
+                break
+            items[i], priorities[i] = items[child], priorities[child]
+            positions[items[i]] = i
+            i = child
+            child = 2 * i + 1
+        items[i], priorities[i] = item, priority
+        positions[item] = i
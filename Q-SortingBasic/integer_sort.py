@@ -0,0 +1,123 @@
+"""比較をしない整数のソート: 計数ソートと LSD 基数ソート
+
+値の範囲が狭い整数列 (ノートブックの問題の 1 <= n <= 1000 や、グリッドのコスト <= 1000 など) は、
+比較ソートの O(n log n) ではなく、計数ソートなら O(n + 値の範囲)、基数ソートなら O(n x 桁数) で並べられる。
+どちらも list (Python の int) 版と numpy 版がある。
+
+ただし比べる相手の list.sort / np.sort は C で書かれているので、計数ソートが速いのは
+値の範囲が要素数に比べて十分狭いとき (目安は 1/10 以下) だけで、基数ソートは手元の計測ではどの範囲でも遅かった
+(python benchmark.py integer で確かめられる)。integer_sort は値の範囲を見て、計数ソートか組み込みのソートを選ぶ。
+"""
+
+from collections import Counter
+from itertools import chain, repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 値の範囲 (max - min + 1) が要素数のこの割合以下なら計数ソートを使う
+COUNTING_RATIO = 0.1
+# 基数ソートの1桁のビット数 (バケットは 2^RADIX_BITS 個)
+RADIX_BITS = 8
+
+
+def counting_sort(array, lo=None, hi=None):
+    """整数のリスト array をその場で計数ソートして返す
+
+    lo / hi: 値の最小値・最大値 (省略すると min / max で求める)。範囲外の値があれば ValueError。
+    数えるのは collections.Counter (C 実装) で行い、値の範囲を小さい順にたどって書き戻す。
+    """
+    if not array:
+        return array
+    if lo is None:
+        lo = min(array)
+    if hi is None:
+        hi = max(array)
+    counts = Counter(array)
+    if len(counts) > hi - lo + 1 or min(counts) < lo or max(counts) > hi:
+        raise ValueError(f"値が範囲 [{lo}, {hi}] の外にあります")
+    # repeat(v, 個数) の連結を map と chain だけで作り、値ごとの Python のループを避ける
+    values = range(lo, hi + 1)
+    array[:] = list(chain.from_iterable(map(repeat, values, map(counts.get, values, repeat(0)))))
+    return array
+
+
+def radix_sort(array, bits=RADIX_BITS):
+    """整数のリスト array をその場で LSD 基数ソートして返す (負の値は最小値を引いてから並べる)
+
+    下位 bits ビットずつ 2^bits 個のバケットに振り分けて連結するのを、最大値の桁数だけ繰り返す。
+    各パスは安定なので、最後のパスの後には全体が整列している。
+    """
+    if not array:
+        return array
+    lo = min(array)
+    span = max(array) - lo
+    mask = (1 << bits) - 1
+    values = [x - lo for x in array] if lo else list(array)
+    for shift in range(0, span.bit_length(), bits):
+        buckets = [[] for _ in range(mask + 1)]
+        appends = [bucket.append for bucket in buckets]
+        for x in values:
+            appends[(x >> shift) & mask](x)
+        values = list(chain.from_iterable(buckets))
+    array[:] = [x + lo for x in values] if lo else values
+    return array
+
+
+def counting_sort_numpy(values):
+    """整数の numpy 配列を np.bincount で数えて np.repeat で並べた新しい配列を返す"""
+    values = np.asarray(values)
+    if not len(values):
+        return values.copy()
+    lo = values.min()
+    counts = np.bincount(values - lo)
+    return np.repeat(np.arange(lo, lo + len(counts), dtype=values.dtype), counts)
+
+
+def radix_sort_numpy(values, bits=RADIX_BITS):
+    """整数の numpy 配列を LSD 基数ソートした新しい配列を返す
+
+    各桁 ((x >> shift) & mask) で安定に並べ替えるのを繰り返す。1桁が 8 ビット以下なら uint8 の
+    argsort(kind="stable") になり、numpy はこれを O(n) の基数ソートで処理する。
+    """
+    values = np.asarray(values)
+    if not len(values):
+        return values.copy()
+    lo = values.min()
+    shifted = (values - lo).astype(np.uint64)
+    span = int(shifted.max())
+    digit = np.uint8 if bits <= 8 else np.uint16
+    mask = np.uint64((1 << bits) - 1)
+    for shift in range(0, span.bit_length(), bits):
+        order = np.argsort(((shifted >> np.uint64(shift)) & mask).astype(digit), kind="stable")
+        shifted = shifted[order]
+    return (shifted.astype(values.dtype) + lo).astype(values.dtype)
+
+
+def choose_integer_sort(n, lo, hi) -> str:
+    """要素数 n・最小値 lo・最大値 hi から "counting" (計数ソート) か "builtin" (組み込みのソート) を選ぶ"""
+    if hi - lo + 1 <= COUNTING_RATIO * n:
+        return "counting"
+    return "builtin"
+
+
+def integer_sort(array):
+    """値の範囲に応じて計数ソートか組み込みのソートを選んで並べる
+
+    list はその場で並べ替えて返し、numpy 配列は並べた新しい配列を返す。
+    int 以外の要素を含む list は、そのまま組み込みのソート (list.sort) で並べる。
+    """
+    if np is not None and isinstance(array, np.ndarray):
+        if len(array) and array.dtype.kind in "iu":
+            if choose_integer_sort(len(array), int(array.min()), int(array.max())) == "counting":
+                return counting_sort_numpy(array)
+        return np.sort(array)
+
+    if array and set(map(type, array)) == {int}:
+        lo, hi = min(array), max(array)
+        if choose_integer_sort(len(array), lo, hi) == "counting":
+            return counting_sort(array, lo, hi)
+    array.sort()
+    return array
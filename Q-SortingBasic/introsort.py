@@ -0,0 +1,88 @@
+"""その場で並べ替えるイントロソート
+
+ノートブックの quick_sort は呼び出しごとに left / middle / right の3つのリストを作り、深さの上限なく再帰する。
+そのため、中央の要素が最大値になる入力 (organ-pipe など) では O(n^2) になり、再帰の上限にも達する。
+ここでは
+  - ピボットは 3 点の中央値 (区間が NINTHER_MIN 以上なら 3 点の中央値を 3 組とってその中央値 = ninther)、
+  - ピボットより小さい / 等しい / 大きい の3つに分ける3分割 (重複が多い入力でも等しい要素は再帰しない)、
+  - 再帰の深さが 2 * floor(log2 n) を超えた区間はヒープソート、
+  - INSERTION_MAX 以下の区間は挿入ソート
+を組み合わせる。小さい側だけ再帰し大きい側はループで処理するので、スタックの深さは O(log n)。
+"""
+
+from bottom_up_merge import insertion_sort_range
+from heap import heap_sort
+
+# これ以下の長さの区間は挿入ソートで整列する
+INSERTION_MAX = 16
+# これ以上の長さの区間では ninther でピボットを選ぶ
+NINTHER_MIN = 40
+
+
+def introsort(array):
+    """array をその場でソートして返す (安定ではない)"""
+    n = len(array)
+    if n > 1:
+        _introsort(array, 0, n, 2 * (n.bit_length() - 1))
+    return array
+
+
+def _introsort(array, lo, hi, depth):
+    while hi - lo > INSERTION_MAX:
+        if depth == 0:
+            heap_sort(array, lo, hi)
+            return
+        depth -= 1
+        lt, gt = partition3(array, lo, hi, choose_pivot(array, lo, hi))
+        # 小さい側だけ再帰し、大きい側はこのループで続ける
+        if lt - lo < hi - gt:
+            _introsort(array, lo, lt, depth)
+            lo = gt
+        else:
+            _introsort(array, gt, hi, depth)
+            hi = lt
+    insertion_sort_range(array, lo, hi)
+
+
+def _median3(array, i, j, k):
+    """array[i], array[j], array[k] の中央値の添字を返す"""
+    a, b, c = array[i], array[j], array[k]
+    if a < b:
+        if b < c:
+            return j
+        return k if a < c else i
+    if a < c:
+        return i
+    return k if b < c else j
+
+
+def choose_pivot(array, lo, hi):
+    """array[lo:hi] のピボットの値を 3 点の中央値か ninther で選ぶ"""
+    last = hi - 1
+    mid = (lo + last) // 2
+    if hi - lo < NINTHER_MIN:
+        return array[_median3(array, lo, mid, last)]
+    step = (hi - lo) // 8
+    first = _median3(array, lo, lo + step, lo + 2 * step)
+    middle = _median3(array, mid - step, mid, mid + step)
+    third = _median3(array, last - 2 * step, last - step, last)
+    return array[_median3(array, first, middle, third)]
+
+
+def partition3(array, lo, hi, pivot):
+    """array[lo:hi] を pivot より小さい / 等しい / 大きい の順に並べ替え、等しい区間 [lt, gt) を返す"""
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        x = array[i]
+        if x < pivot:
+            array[i] = array[lt]
+            array[lt] = x
+            lt += 1
+            i += 1
+        elif pivot < x:
+            gt -= 1
+            array[i] = array[gt]
+            array[gt] = x
+        else:
+            i += 1
+    return lt, gt
@@ -0,0 +1,182 @@
+"""SortBasic.ipynb のソートアルゴリズムをモジュールにしたもの
+
+各関数の中身はノートブックのままで、どれも「リストを受け取り、ソート済みのリストを返す」。
+ただし入力のリストを書き換えるもの (バブル・挿入・選択) と、新しいリストを作るもの (クイック・マージ・ヒープ) がある。
+ヒープソートは入力のリストを空にする。
+入力を書き換えずに使いたいときや、アルゴリズムを名前で選びたいときは sort(array, algorithm) を使う。
+ALGORITHMS にはノートブックの版を改良した別モジュールの実装も登録している。
+"""
+
+import heap
+from bottom_up_merge import bottom_up_merge_sort
+from integer_sort import counting_sort, integer_sort, radix_sort
+from introsort import introsort
+
+
+def bubble_sort(array):
+    n = len(array)
+    for i in range(n):
+        for j in range(n - i - 1):
+            if array[j] > array[j + 1]:
+                array[j], array[j + 1] = array[j + 1], array[j]
+    return array
+
+
+def insertion_sort(array):
+    for i in range(1, len(array)):
+        # keyを取り出す
+        key = array[i]
+
+        # 整列済み列のうち、keyを入れるべき場所まで、右にずらして空ける
+        j = i - 1
+        while j >= 0 and key < array[j]:
+            array[j + 1] = array[j]
+            j -= 1
+
+        # keyを挿入
+        array[j + 1] = key
+    return array
+
+
+def selection_sort(array):
+    n = len(array)
+    for i in range(n):
+        # 最小値のindexを見つける
+        min_idx = i
+        for j in range(i + 1, n):
+            if array[j] < array[min_idx]:
+                min_idx = j
+        # 最小値を左端に移動して入れ替える
+        array[i], array[min_idx] = array[min_idx], array[i]
+    return array
+
+
+def quick_sort(array):
+    # 配列が空か1要素の場合はそのまま返す
+    if len(array) <= 1:
+        return array
+
+    # 配列の中央の数をpivotとして選択
+    pivot = array[len(array) // 2]
+
+    # pivotより小さい要素を左、大きい要素を右に分ける
+    left = [x for x in array if x < pivot]
+    middle = [x for x in array if x == pivot]
+    right = [x for x in array if x > pivot]
+
+    # 再帰的にソート
+    return quick_sort(left) + middle + quick_sort(right)
+
+
+def merge(left, right):
+    """
+    leftとrightをマージする
+    (すでにleftとrightはソートされていることを前提とする)
+    """
+    result = []
+
+    # どちらかの配列が空になるまで、最小値をresultに入れ込む
+    while left and right:
+        if left[0] < right[0]:
+            result.append(left.pop(0))
+        else:
+            result.append(right.pop(0))
+
+    # 残りの要素を追加(どちらかは空)
+    result.extend(left)
+    result.extend(right)
+
+    return result
+
+
+def merge_sort(array):
+    if len(array) <= 1:
+        return array
+
+    mid = len(array) // 2
+    left = merge_sort(array[:mid])
+    right = merge_sort(array[mid:])
+
+    return merge(left, right)
+
+
+def heapify(arr, i):
+    """
+    arrのi番目より下のツリーをヒープ化する
+
+    arr: リスト
+    i: 現在のノードのindex
+    """
+    largest = i  # 現在のノードを最大値と仮定
+    left = 2 * i + 1  # 左の子ノード
+    right = 2 * i + 2  # 右の子ノード
+
+    # 最大値となるノードを選択
+    if left < len(arr) and arr[largest] < arr[left]:
+        largest = left
+    if right < len(arr) and arr[largest] < arr[right]:
+        largest = right
+
+    # 最大値が現在のノードでない場合、スワップして再帰的にheapify
+    if largest != i:
+        arr[i], arr[largest] = arr[largest], arr[i]
+
+        # leftまたはrightはヒープが保証されていないので、再帰的にheapify
+        heapify(arr, largest)
+
+
+def heap_sort(array):
+    n = len(array)
+
+    # ヒープ構築（配列全体を最大ヒープに変換）
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(array, i)
+
+    # ヒープから最大値を取り出し&ヒープ再構築を繰り返す
+    # (ノートブックの版は array.pop(0) で根を取り除いていたが、残りの要素が1つずつ前にずれて
+    #  ヒープの形が崩れるため、末尾の要素を根に移してから heapify する)
+    result = []
+    while array:
+        # 最大値をresultの先頭に挿入
+        top = array[0]
+        last = array.pop()
+        if array:
+            array[0] = last
+        result.insert(0, top)
+
+        # heapを再構築
+        heapify(array, 0)
+
+    return result
+
+
+def builtin_sort(array):
+    """比較の基準にする組み込みの sorted"""
+    return sorted(array)
+
+
+# 名前 -> ソート関数。sort() とベンチマークはここからアルゴリズムを選ぶ
+ALGORITHMS = {
+    "bubble": bubble_sort,
+    "insertion": insertion_sort,
+    "selection": selection_sort,
+    "quick": quick_sort,
+    "merge": merge_sort,
+    "heap": heap_sort,
+    "bottom-up-merge": bottom_up_merge_sort,
+    "introsort": introsort,
+    "heap-in-place": heap.heap_sort,
+    "counting": counting_sort,
+    "radix": radix_sort,
+    "integer": integer_sort,
+    "builtin": builtin_sort,
+}
+
+
+def sort(array, algorithm="introsort") -> list:
+    """array を algorithm (ALGORITHMS のキー) でソートした新しいリストを返す (array は書き換えない)"""
+    try:
+        func = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"algorithm は {', '.join(ALGORITHMS)} のいずれかです: {algorithm!r}") from None
+    return func(list(array))